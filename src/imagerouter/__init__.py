@@ -11,22 +11,63 @@ Example:
     >>> print(f"Estimated cost: ${estimate.total_average:.2f}")
 """
 
-from .client import ImageRouterClient
-from .estimator import CostEstimate, CostEstimator
-from .exceptions import (
-    AuthenticationError,
-    GenerationError,
-    ImageRouterError,
-    InsufficientCreditsError,
-    ModelNotFoundError,
-    NetworkError,
-    RateLimitError,
-    ValidationError,
-)
-from .generators import ImageGenerator, VideoGenerator
-from .models import ModelInfo, ModelRegistry, PricingInfo
-
-__version__ = "0.1.0"
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import ImageRouterClient
+    from .estimator import CostEstimate, CostEstimator
+    from .exceptions import (
+        AuthenticationError,
+        GenerationError,
+        ImageRouterError,
+        InsufficientCreditsError,
+        ModelNotFoundError,
+        NetworkError,
+        RateLimitError,
+        ValidationError,
+    )
+    from .generators import ImageGenerator, VideoGenerator
+    from .models import ModelInfo, ModelRegistry, PricingInfo
+
+# Public names are resolved on first access so that importing a submodule
+# (e.g. the CLI) does not pull in requests and the rest of the API stack.
+_LAZY_IMPORTS = {
+    "ImageRouterClient": ".client",
+    "CostEstimator": ".estimator",
+    "CostEstimate": ".estimator",
+    "ImageGenerator": ".generators",
+    "VideoGenerator": ".generators",
+    "ModelRegistry": ".models",
+    "ModelInfo": ".models",
+    "PricingInfo": ".models",
+    "ImageRouterError": ".exceptions",
+    "AuthenticationError": ".exceptions",
+    "RateLimitError": ".exceptions",
+    "InsufficientCreditsError": ".exceptions",
+    "ModelNotFoundError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "GenerationError": ".exceptions",
+    "NetworkError": ".exceptions",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
+
+__version__ = "0.7.3"  # keep in sync with pyproject.toml
 
 __all__ = [
     # Client
@@ -3,53 +3,74 @@
 from __future__ import annotations
 
 import argparse
-import json
+import functools
 import sys
-from typing import NoReturn
+from typing import Any, NoReturn
 
-from .client import ImageRouterClient
-from .estimator import CostEstimator
-from .exceptions import ImageRouterError
-from .generators import ImageGenerator, VideoGenerator
-from .models import ModelRegistry
+import orjson
 
+from . import __version__
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser for the CLI."""
+# Subcommand names and their help text, in display order
+SUBCOMMANDS = {
+    "estimate": "Estimate generation cost (default mode, no API cost)",
+    "generate": "Execute generation (requires --execute flag)",
+    "models": "List available models",
+    "credits": "Show account balance",
+}
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    """Detect the requested subcommand without building the parser.
+
+    The top-level parser accepts no options besides --help and --version,
+    so the subcommand is always the first argument of a valid command line.
+
+    Args:
+        argv: Command-line arguments, excluding the program name.
+
+    Returns:
+        The subcommand name, or None if the first argument is not one.
+    """
+    if argv and argv[0] in SUBCOMMANDS:
+        return argv[0]
+    return None
+
+
+@functools.cache
+def create_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Create the argument parser for the CLI.
+
+    Parsers are cached per command and shared between callers, so the
+    returned parser must not be modified. parse_args() does not mutate it.
+
+    Args:
+        command: If given, only the subparser for this command is built.
+            Otherwise all subcommands are added (needed for top-level help).
+    """
     parser = argparse.ArgumentParser(
         prog="imagerouter",
         description="ImageRouter Video/Image Generation CLI",
     )
-
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    # Estimate command
-    estimate_parser = subparsers.add_parser(
-        "estimate",
-        help="Estimate generation cost (default mode, no API cost)",
-    )
-    _add_estimate_args(estimate_parser)
-
-    # Generate command
-    generate_parser = subparsers.add_parser(
-        "generate",
-        help="Execute generation (requires --execute flag)",
+    parser.add_argument(
+        "-V",
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}",
     )
-    _add_generate_args(generate_parser)
 
-    # Models command
-    models_parser = subparsers.add_parser(
-        "models",
-        help="List available models",
-    )
-    _add_models_args(models_parser)
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    # Credits command
-    credits_parser = subparsers.add_parser(
-        "credits",
-        help="Show account balance",
-    )
-    _add_credits_args(credits_parser)
+    add_args = {
+        "estimate": _add_estimate_args,
+        "generate": _add_generate_args,
+        "models": _add_models_args,
+        "credits": _add_credits_args,
+    }
+    names = [command] if command else list(SUBCOMMANDS)
+    for name in names:
+        subparser = subparsers.add_parser(name, help=SUBCOMMANDS[name])
+        add_args[name](subparser)
 
     return parser
 
@@ -93,6 +114,11 @@ def _add_estimate_args(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Output as JSON",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalidate the cached model list with the API",
+    )
 
 
 def _add_generate_args(parser: argparse.ArgumentParser) -> None:
@@ -173,6 +199,11 @@ def _add_models_args(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Output as JSON",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalidate the cached model list with the API",
+    )
 
 
 def _add_credits_args(parser: argparse.ArgumentParser) -> None:
@@ -184,89 +215,100 @@ def _add_credits_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def cmd_estimate(args: argparse.Namespace) -> int:
-    """Handle the estimate command."""
-    client = ImageRouterClient()
-    estimator = CostEstimator(client)
-
-    if args.type == "video":
-        estimate = estimator.estimate_video(
-            model=args.model,
-            seconds=args.seconds,
-            count=args.count,
-        )
-    else:
-        estimate = estimator.estimate_image(
-            model=args.model,
-            quality=args.quality,
-            size=args.size,
-            count=args.count,
-        )
-
-    if args.json:
-        print(json.dumps(estimate.to_dict(), indent=2))
-    else:
-        print(estimate.format_summary())
-
-    return 0
+def _format_json(data: Any) -> str:
+    """Serialize data as indented JSON for output."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
 
 
-def cmd_generate(args: argparse.Namespace) -> int:
-    """Handle the generate command."""
-    client = ImageRouterClient()
+def cmd_estimate(args: argparse.Namespace) -> int:
+    """Handle the estimate command."""
+    from .client import ImageRouterClient
+    from .estimator import CostEstimator
 
-    if args.type == "video":
-        generator = VideoGenerator(client)
+    cache_ttl = 0 if args.no_cache else None
+    with ImageRouterClient(models_cache_ttl=cache_ttl) as client:
+        estimator = CostEstimator(client)
 
-        if args.image:
-            # Image-to-video
-            result = generator.image_to_video(
-                image_path=args.image,
-                prompt=args.prompt,
+        if args.type == "video":
+            estimate = estimator.estimate_video(
                 model=args.model,
-                seconds=args.seconds if args.seconds else "auto",
-                size=args.size,
-                response_format=args.format,
-                output_path=args.output,
+                seconds=args.seconds,
+                count=args.count,
             )
         else:
-            # Text-to-video
-            result = generator.text_to_video(
-                prompt=args.prompt,
+            estimate = estimator.estimate_image(
                 model=args.model,
-                seconds=args.seconds if args.seconds else "auto",
+                quality=args.quality,
                 size=args.size,
-                response_format=args.format,
-                output_path=args.output,
+                count=args.count,
             )
+
+    if args.json:
+        print(_format_json(estimate.to_dict()))
     else:
-        generator = ImageGenerator(client)
+        print(estimate.format_summary())
 
-        if args.image:
-            # Image-to-image
-            result = generator.image_to_image(
-                image_path=args.image,
-                prompt=args.prompt,
-                model=args.model,
-                mask_path=args.mask,
-                quality=args.quality,
-                size=args.size,
-                response_format=args.format,
-                output_path=args.output,
-            )
+    return 0
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    """Handle the generate command."""
+    from .client import ImageRouterClient
+    from .generators import ImageGenerator, VideoGenerator
+
+    with ImageRouterClient() as client:
+        if args.type == "video":
+            generator = VideoGenerator(client)
+
+            if args.image:
+                # Image-to-video
+                result = generator.image_to_video(
+                    image_path=args.image,
+                    prompt=args.prompt,
+                    model=args.model,
+                    seconds=args.seconds if args.seconds else "auto",
+                    size=args.size,
+                    response_format=args.format,
+                    output_path=args.output,
+                )
+            else:
+                # Text-to-video
+                result = generator.text_to_video(
+                    prompt=args.prompt,
+                    model=args.model,
+                    seconds=args.seconds if args.seconds else "auto",
+                    size=args.size,
+                    response_format=args.format,
+                    output_path=args.output,
+                )
         else:
-            # Text-to-image
-            result = generator.text_to_image(
-                prompt=args.prompt,
-                model=args.model,
-                quality=args.quality,
-                size=args.size,
-                response_format=args.format,
-                output_path=args.output,
-            )
+            generator = ImageGenerator(client)
+
+            if args.image:
+                # Image-to-image
+                result = generator.image_to_image(
+                    image_path=args.image,
+                    prompt=args.prompt,
+                    model=args.model,
+                    mask_path=args.mask,
+                    quality=args.quality,
+                    size=args.size,
+                    response_format=args.format,
+                    output_path=args.output,
+                )
+            else:
+                # Text-to-image
+                result = generator.text_to_image(
+                    prompt=args.prompt,
+                    model=args.model,
+                    quality=args.quality,
+                    size=args.size,
+                    response_format=args.format,
+                    output_path=args.output,
+                )
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(_format_json(result))
     else:
         # Print summary
         data = result.get("data", [])
@@ -285,10 +327,16 @@ def cmd_generate(args: argparse.Namespace) -> int:
 
 def cmd_models(args: argparse.Namespace) -> int:
     """Handle the models command."""
-    client = ImageRouterClient()
-    registry = ModelRegistry(client)
-
-    models = registry.get_models_by_type(args.type) if args.type else registry.get_all_models()
+    from .client import ImageRouterClient
+    from .models import ModelRegistry
+
+    cache_ttl = 0 if args.no_cache else None
+    with ImageRouterClient(models_cache_ttl=cache_ttl) as client:
+        registry = ModelRegistry(client)
+        if args.type:
+            models = registry.get_models_by_type(args.type)
+        else:
+            models = registry.get_all_models()
 
     if args.json:
         output = {
@@ -308,35 +356,39 @@ def cmd_models(args: argparse.Namespace) -> int:
             }
             for model_id, info in models.items()
         }
-        print(json.dumps(output, indent=2))
+        print(_format_json(output))
     else:
         type_label = "video" if args.type == "video" else "image" if args.type == "image" else ""
-        print(f"Available {type_label} models:\n")
+        # Build the whole listing and write it once rather than per line
+        lines = [f"Available {type_label} models:", ""]
         for model_id, info in sorted(models.items()):
             min_price, _, max_price = info.pricing.get_estimate()
             if min_price == max_price:
                 price_str = f"${min_price:.2f}"
             else:
                 price_str = f"${min_price:.2f} - ${max_price:.2f}"
-            print(f"  {model_id}")
-            print(f"    Provider: {info.provider}")
-            print(f"    Price: {price_str}")
+            lines.append(f"  {model_id}")
+            lines.append(f"    Provider: {info.provider}")
+            lines.append(f"    Price: {price_str}")
             if info.supported_durations:
-                print(f"    Durations: {info.supported_durations}s")
+                lines.append(f"    Durations: {info.supported_durations}s")
             if info.supports_edit:
-                print("    Supports edit: Yes")
-            print()
+                lines.append("    Supports edit: Yes")
+            lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return 0
 
 
 def cmd_credits(args: argparse.Namespace) -> int:
     """Handle the credits command."""
-    client = ImageRouterClient()
-    credits = client.get_credits()
+    from .client import ImageRouterClient
+
+    with ImageRouterClient() as client:
+        credits = client.get_credits()
 
     if args.json:
-        print(json.dumps(credits, indent=2))
+        print(_format_json(credits))
     else:
         remaining = credits.get("remaining_credits", 0)
         usage = credits.get("credit_usage", 0)
@@ -352,13 +404,23 @@ def cmd_credits(args: argparse.Namespace) -> int:
 
 def main() -> NoReturn:
     """Main entry point for the CLI."""
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+
+    # Answer a bare version query without building any parser
+    if argv in (["-V"], ["--version"]):
+        print(f"imagerouter {__version__}")
+        sys.exit(0)
+
+    parser = create_parser(_sniff_subcommand(argv))
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         sys.exit(0)
 
+    # Imported here so that --help and argparse errors never load the API stack
+    from .exceptions import ImageRouterError
+
     try:
         if args.command == "estimate":
             exit_code = cmd_estimate(args)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import time
-from typing import Any, BinaryIO
+from pathlib import Path
+from typing import Any, BinaryIO, cast
 
+import orjson
 import requests
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
+from urllib3.util.retry import Retry
 
 from .exceptions import (
     AuthenticationError,
@@ -20,13 +25,98 @@ from .exceptions import (
     ValidationError,
 )
 
-# Load environment variables from .env file
-load_dotenv()
-
 BASE_URL = "https://api.imagerouter.io"
+USER_AGENT = "imagerouter-python/0.1.0"
 DEFAULT_TIMEOUT = 300  # 5 minutes for video generation
 DEFAULT_MAX_RETRIES = 3
 
+# Rate limits are retried for every method. Transient 5xx responses are only
+# retried for GET: a failed generation POST may already have been billed, so
+# it surfaces as GenerationError instead.
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(["GET", "POST"])
+RETRY_BACKOFF_JITTER = 0.3
+
+DEFAULT_MODELS_CACHE_TTL = 24 * 60 * 60  # 1 day
+# One cache file per API base URL, so different endpoints never share an ETag
+MODELS_CACHE_FILE = "models-{key}.json"
+
+
+def _default_cache_dir() -> Path | None:
+    """Resolve the default model list cache directory.
+
+    Follows XDG_CACHE_HOME, then ~/.cache. Resolved per client rather than at
+    import, since there may be no home directory (e.g. in containers).
+
+    Returns:
+        Cache directory, or None if no home directory can be determined.
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "imagerouter"
+    try:
+        return Path.home() / ".cache" / "imagerouter"
+    except RuntimeError:
+        return None
+
+
+class _ApiRetry(Retry):
+    """Retry policy that never repeats a non-GET request after a server error."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code >= 500 and method.upper() != "GET":
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class _MultipartBody:
+    """Streaming multipart/form-data request body.
+
+    Wraps MultipartEncoder so uploads are read from disk in chunks instead of
+    being buffered in memory. The body can be rewound to its start, which
+    urllib3 needs to resend it when retrying a request.
+
+    Args:
+        data: Form field data.
+        files: Files as {field_name: (filename, file_object, mime_type)}.
+    """
+
+    def __init__(self, data: dict[str, Any], files: dict[str, tuple[str, BinaryIO, str]]) -> None:
+        # None fields are left out, as requests does for form data
+        self._fields: dict[str, Any] = {
+            key: str(value) for key, value in data.items() if value is not None
+        }
+        self._fields.update(files)
+        self._file_positions = [(f, f.tell()) for _, f, _ in files.values()]
+        self._encoder = MultipartEncoder(fields=self._fields)
+        self._boundary = self._encoder.boundary_value
+        self._bytes_read = 0
+
+    @property
+    def content_type(self) -> str:
+        return str(self._encoder.content_type)
+
+    @property
+    def len(self) -> int:
+        return int(self._encoder.len)
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = cast(bytes, self._encoder.read(size))
+        self._bytes_read += len(chunk)
+        return chunk
+
+    def tell(self) -> int:
+        return self._bytes_read
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if offset != 0 or whence != 0:
+            raise OSError("Multipart body can only be rewound to the start")
+        for file_obj, position in self._file_positions:
+            file_obj.seek(position)
+        self._encoder = MultipartEncoder(fields=self._fields, boundary=self._boundary)
+        self._bytes_read = 0
+        return 0
+
 
 class ImageRouterClient:
     """Main API client for ImageRouter.io.
@@ -39,14 +129,21 @@ class ImageRouterClient:
         timeout: Request timeout in seconds. Defaults to IMAGEROUTER_TIMEOUT env var or 300.
         max_retries: Maximum retry attempts for transient errors.
             Defaults to IMAGEROUTER_MAX_RETRIES env var or 3.
+        cache_dir: Directory for the on-disk model list cache.
+            Defaults to IMAGEROUTER_CACHE_DIR env var, then
+            $XDG_CACHE_HOME/imagerouter or ~/.cache/imagerouter. Without a home
+            directory the model list is not cached.
+        models_cache_ttl: Seconds a cached model list is used without contacting
+            the API; after that it is revalidated with its ETag. 0 always revalidates.
+            Defaults to IMAGEROUTER_MODELS_CACHE_TTL env var or 86400.
 
     Raises:
         AuthenticationError: If no API key is provided or found in environment.
 
     Example:
-        >>> client = ImageRouterClient()
-        >>> models = client.list_models(output_type="video")
-        >>> credits = client.get_credits()
+        >>> with ImageRouterClient() as client:
+        ...     models = client.list_models(output_type="video")
+        ...     credits = client.get_credits()
     """
 
     def __init__(
@@ -54,7 +151,15 @@ class ImageRouterClient:
         api_key: str | None = None,
         timeout: int | None = None,
         max_retries: int | None = None,
+        cache_dir: str | Path | None = None,
+        models_cache_ttl: int | None = None,
     ) -> None:
+        # Only look for a .env file when the API key isn't already available
+        if api_key is None and not os.environ.get("IMAGEROUTER_API_KEY"):
+            from dotenv import load_dotenv
+
+            load_dotenv()
+
         self.api_key = api_key or os.environ.get("IMAGEROUTER_API_KEY")
         if not self.api_key:
             raise AuthenticationError(
@@ -67,13 +172,46 @@ class ImageRouterClient:
             os.environ.get("IMAGEROUTER_MAX_RETRIES", DEFAULT_MAX_RETRIES)
         )
         self.base_url = BASE_URL
+        cache_dir = cache_dir or os.environ.get("IMAGEROUTER_CACHE_DIR")
+        self.cache_dir = Path(cache_dir) if cache_dir else _default_cache_dir()
+        if models_cache_ttl is None:
+            models_cache_ttl = int(
+                os.environ.get("IMAGEROUTER_MODELS_CACHE_TTL", DEFAULT_MODELS_CACHE_TTL)
+            )
+        self.models_cache_ttl = models_cache_ttl
+
+        # max_retries counts total attempts, urllib3 counts retries after the first
+        retry = _ApiRetry(
+            total=max(self.max_retries - 1, 0),
+            backoff_factor=1.0,
+            backoff_jitter=RETRY_BACKOFF_JITTER,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
 
-    def _get_headers(self) -> dict[str, str]:
-        """Get request headers with authentication."""
-        return {
-            "Authorization": f"Bearer {self.api_key}",
-            "User-Agent": "imagerouter-python/0.1.0",
-        }
+        # Share one connection pool across requests to keep TLS connections alive
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self._session.mount("https://", adapter)
+        # Set once here so no per-request header dicts are built
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "User-Agent": USER_AGENT,
+            }
+        )
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> ImageRouterClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def _handle_error_response(self, response: requests.Response) -> None:
         """Handle error responses from the API.
@@ -92,33 +230,88 @@ class ImageRouterClient:
         """
         status_code = response.status_code
         try:
-            data = response.json()
-        except ValueError:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
             data = {"error": {"message": response.text}}
 
-        error_message = data.get("error", {}).get("message", response.text)
+        error = data.get("error") if isinstance(data, dict) else None
+        if isinstance(error, dict):
+            error_message = error.get("message", response.text)
+        else:
+            error_message = response.text
+        lowered = error_message.lower()
+
+        match status_code:
+            case 401:
+                raise AuthenticationError(error_message, status_code, data)
+            case 429:
+                raise RateLimitError(error_message, status_code, data)
+            case 400:
+                raise ValidationError(error_message, status_code, data)
+            case 404:
+                if "model" in lowered:
+                    raise ModelNotFoundError(error_message, status_code, data)
+                raise ImageRouterError(error_message, status_code, data)
+
+        if status_code == 402 or "credit" in lowered:
+            raise InsufficientCreditsError(error_message, status_code, data)
+
+        if 500 <= status_code < 600:
+            raise GenerationError(error_message, status_code, data)
 
-        if status_code == 401:
-            raise AuthenticationError(error_message, status_code, data)
+        raise ImageRouterError(error_message, status_code, data)
 
-        if status_code == 429:
-            raise RateLimitError(error_message, status_code, data)
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: dict[str, Any] | None = None,
+        data: dict[str, Any] | _MultipartBody | None = None,
+        files: dict[str, tuple[str, BinaryIO, str]] | None = None,
+        timeout: int | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> requests.Response:
+        """Send an HTTP request to the API with retry logic.
+
+        Args:
+            method: HTTP method (GET, POST, etc.).
+            endpoint: API endpoint (e.g., '/v1/models').
+            json_data: JSON body for the request.
+            data: Form data, or a streaming multipart body.
+            files: Files for multipart upload.
+            timeout: Override default timeout for this request.
+            headers: Extra headers merged over the session headers.
 
-        if status_code == 400:
-            raise ValidationError(error_message, status_code, data)
+        Returns:
+            The successful (status < 400) HTTP response.
 
-        if status_code == 404:
-            if "model" in error_message.lower():
-                raise ModelNotFoundError(error_message, status_code, data)
-            raise ImageRouterError(error_message, status_code, data)
+        Raises:
+            NetworkError: For connection or timeout errors after retries.
+            Various ImageRouterError subclasses for API errors.
+        """
+        url = f"{self.base_url}{endpoint}"
+        request_timeout = timeout or self.timeout
 
-        if status_code == 402 or "credit" in error_message.lower():
-            raise InsufficientCreditsError(error_message, status_code, data)
+        # Retries for connection errors, timeouts, 429s and GET 5xx happen in the adapter
+        try:
+            response = self._session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                json=json_data,
+                data=data,
+                files=files,
+                timeout=request_timeout,
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise NetworkError(f"Request failed after {self.max_retries} attempts: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"Request failed: {e}") from e
 
-        if 500 <= status_code < 600:
-            raise GenerationError(error_message, status_code, data)
+        if response.status_code >= 400:
+            self._handle_error_response(response)
 
-        raise ImageRouterError(error_message, status_code, data)
+        return response
 
     def _request(
         self,
@@ -129,7 +322,7 @@ class ImageRouterClient:
         files: dict[str, tuple[str, BinaryIO, str]] | None = None,
         timeout: int | None = None,
     ) -> dict[str, Any]:
-        """Make an HTTP request to the API with retry logic.
+        """Make an HTTP request to the API and parse the JSON response.
 
         Args:
             method: HTTP method (GET, POST, etc.).
@@ -146,57 +339,93 @@ class ImageRouterClient:
             NetworkError: For connection or timeout errors after retries.
             Various ImageRouterError subclasses for API errors.
         """
-        url = f"{self.base_url}{endpoint}"
-        headers = self._get_headers()
-        request_timeout = timeout or self.timeout
-
-        last_exception: Exception | None = None
-
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=json_data,
-                    data=data,
-                    files=files,
-                    timeout=request_timeout,
-                )
-
-                if response.status_code >= 400:
-                    # Don't retry client errors (4xx) except rate limits
-                    if response.status_code == 429:
-                        retry_after = int(response.headers.get("Retry-After", 2 ** attempt))
-                        time.sleep(retry_after)
-                        continue
-                    self._handle_error_response(response)
-
-                return response.json()
-
-            except requests.exceptions.Timeout as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
-                    continue
-            except requests.exceptions.ConnectionError as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
-                    continue
-            except requests.exceptions.RequestException as e:
-                raise NetworkError(f"Request failed: {e}") from e
-
-        raise NetworkError(
-            f"Request failed after {self.max_retries} attempts: {last_exception}"
+        response = self._send(
+            method, endpoint, json_data=json_data, data=data, files=files, timeout=timeout
         )
+        return orjson.loads(response.content)
 
-    def list_models(self, output_type: str | None = None) -> dict[str, Any]:
+    def _models_cache_file(self) -> Path | None:
+        """Get the model list cache file for this client's base URL, if caching."""
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(self.base_url.encode()).hexdigest()[:16]
+        return self.cache_dir / MODELS_CACHE_FILE.format(key=key)
+
+    def _read_models_cache(self) -> tuple[dict[str, Any], str | None, float] | None:
+        """Read the cached model list.
+
+        Returns:
+            Tuple of (response data, ETag, age in seconds), or None if there is
+            no usable cache entry.
+        """
+        cache_file = self._models_cache_file()
+        if cache_file is None:
+            return None
+        try:
+            age = time.time() - cache_file.stat().st_mtime
+            entry = orjson.loads(cache_file.read_bytes())
+            return entry["response"], entry.get("etag"), age
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_models_cache(self, response: dict[str, Any], etag: str | None) -> None:
+        """Store the model list on disk. Failures are ignored."""
+        cache_file = self._models_cache_file()
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            tmp_file.write_bytes(orjson.dumps({"etag": etag, "response": response}))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    def _fetch_models(self, revalidate: bool = False) -> dict[str, Any]:
+        """Get the raw /v1/models response, using the on-disk cache when possible.
+
+        A cache entry younger than models_cache_ttl is returned without a
+        request. Older entries are revalidated with If-None-Match, so an
+        unchanged model list costs a 304 instead of the full payload.
+
+        Args:
+            revalidate: Ignore the TTL and always check with the API.
+
+        Returns:
+            Parsed /v1/models response data.
+        """
+        cached = self._read_models_cache()
+        headers = None
+        if cached is not None:
+            response_data, etag, age = cached
+            if not revalidate and age < self.models_cache_ttl:
+                return response_data
+            if etag:
+                headers = {"If-None-Match": etag}
+
+        response = self._send("GET", "/v1/models", headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            # Unchanged: rewrite to reset the cache age
+            self._write_models_cache(cached[0], cached[1])
+            return cached[0]
+
+        response_data = cast(dict[str, Any], orjson.loads(response.content))
+        self._write_models_cache(response_data, response.headers.get("ETag"))
+        return response_data
+
+    def list_models(
+        self, output_type: str | None = None, revalidate: bool = False
+    ) -> dict[str, Any]:
         """Fetch available models with pricing information.
 
+        The model list is cached on disk (see cache_dir and models_cache_ttl).
+
         Args:
             output_type: Filter by output type ('image' or 'video').
                 If None, returns all models.
+            revalidate: Check the cached model list with the API even if it
+                is still within its TTL.
 
         Returns:
             Dict mapping model_id to model info including pricing data.
@@ -207,25 +436,17 @@ class ImageRouterClient:
             >>> for model_id, info in models.items():
             ...     print(f"{model_id}: {info['pricing']}")
         """
-        response = self._request("GET", "/v1/models")
+        response = self._fetch_models(revalidate=revalidate)
         models = response.get("data", [])
 
-        # Convert list to dict keyed by model ID
-        result = {}
-        for model in models:
-            model_id = model.get("id")
-            if not model_id:
-                continue
-
-            # Filter by output type if specified
-            if output_type:
-                model_outputs = model.get("output", [])
-                if output_type not in model_outputs:
-                    continue
-
-            result[model_id] = model
-
-        return result
+        # Convert list to dict keyed by model ID, filtering by output type if given
+        if not output_type:
+            return {model["id"]: model for model in models if model.get("id")}
+        return {
+            model["id"]: model
+            for model in models
+            if model.get("id") and output_type in model.get("output", ())
+        }
 
     def get_credits(self) -> dict[str, Any]:
         """Get account credit balance.
@@ -285,6 +506,8 @@ class ImageRouterClient:
     ) -> dict[str, Any]:
         """Make a POST request with multipart form data.
 
+        Files are streamed from their file objects rather than read into memory.
+
         Args:
             endpoint: API endpoint.
             data: Form field data.
@@ -294,4 +517,12 @@ class ImageRouterClient:
         Returns:
             Parsed JSON response.
         """
-        return self._request("POST", endpoint, data=data, files=files, timeout=timeout)
+        body = _MultipartBody(data, files)
+        response = self._send(
+            "POST",
+            endpoint,
+            data=body,
+            headers={"Content-Type": body.content_type},
+            timeout=timeout,
+        )
+        return cast(dict[str, Any], orjson.loads(response.content))
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from .exceptions import ValidationError
 from .models import ModelRegistry
@@ -12,10 +13,12 @@ if TYPE_CHECKING:
     from .client import ImageRouterClient
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CostEstimate:
     """Cost estimate for a generation request.
 
+    Instances are immutable and hashable.
+
     Attributes:
         model: Model ID used for the estimate.
         generation_type: Type of generation ('video' or 'image').
@@ -166,6 +169,30 @@ class CostEstimator:
             total_average=total_avg,
         )
 
+    def estimate_video_batch(self, requests: Iterable[Mapping[str, Any]]) -> list[CostEstimate]:
+        """Estimate video generation cost for several requests at once.
+
+        Model data is fetched once and shared by all requests.
+
+        Args:
+            requests: Requests with a 'model' key and optional 'seconds' and
+                'count' keys, as accepted by estimate_video.
+
+        Returns:
+            List of CostEstimate objects in the same order as the requests.
+
+        Raises:
+            ModelNotFoundError: If any model doesn't exist.
+            ValidationError: If any request is invalid.
+
+        Example:
+            >>> estimates = estimator.estimate_video_batch([
+            ...     {"model": "google/veo-3.1-fast", "seconds": 4},
+            ...     {"model": "kwaivgi/kling-2.1-standard", "seconds": 10, "count": 2},
+            ... ])
+        """
+        return [self.estimate_video(**request) for request in requests]
+
     def estimate_image(
         self,
         model: str,
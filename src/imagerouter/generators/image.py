@@ -2,15 +2,15 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import io
 from typing import TYPE_CHECKING, Any
 
 from ..exceptions import ValidationError
 from ..utils import (
     close_file_handles,
-    download_file,
+    decode_base64_content,
     prepare_multiple_images,
-    save_base64_content,
+    save_generation_output,
     validate_prompt,
 )
 
@@ -103,7 +103,7 @@ class ImageGenerator:
 
         # Handle output file saving
         if output_path:
-            self._save_output(result, output_path)
+            save_generation_output(result, output_path)
 
         return result
 
@@ -150,13 +150,13 @@ class ImageGenerator:
         image_paths = [image_path] if isinstance(image_path, str) else image_path
         image_tuples = prepare_multiple_images(image_paths)
 
-        # Prepare mask files if provided
         mask_tuples = []
-        if mask_path:
-            mask_paths = [mask_path] if isinstance(mask_path, str) else mask_path
-            mask_tuples = prepare_multiple_images(mask_paths)
-
         try:
+            # Prepare mask files if provided
+            if mask_path:
+                mask_paths = [mask_path] if isinstance(mask_path, str) else mask_path
+                mask_tuples = prepare_multiple_images(mask_paths)
+
             # Build form data
             form_data: dict[str, Any] = {
                 "prompt": clean_prompt,
@@ -183,7 +183,7 @@ class ImageGenerator:
 
             # Handle output file saving
             if output_path:
-                self._save_output(result, output_path)
+                save_generation_output(result, output_path)
 
             return result
 
@@ -191,28 +191,35 @@ class ImageGenerator:
             close_file_handles(image_tuples)
             close_file_handles(mask_tuples)
 
-    def _save_output(self, result: dict[str, Any], output_path: str) -> Path:
-        """Save generation output to local file.
+    def get_bytes(self, result: dict[str, Any]) -> io.BytesIO:
+        """Decode a base64 generation result in memory without touching disk.
+
+        Useful with response_format='b64_json' or 'b64_ephemeral' when the
+        image is consumed directly rather than saved.
 
         Args:
             result: API response dict.
-            output_path: Local path to save to.
 
         Returns:
-            Path to the saved file.
+            In-memory binary stream of the first image.
+
+        Raises:
+            ValidationError: If the response has no base64 data.
+
+        Example:
+            >>> result = generator.text_to_image(
+            ...     prompt="A red fox",
+            ...     model="openai/gpt-image-1",
+            ...     response_format="b64_ephemeral"
+            ... )
+            >>> image = generator.get_bytes(result)
         """
         data = result.get("data", [])
         if not data:
             raise ValidationError("No output data in response")
 
         first_item = data[0]
+        if "b64_json" not in first_item:
+            raise ValidationError("Response contains no base64 data")
 
-        # Check for URL response
-        if "url" in first_item:
-            return download_file(first_item["url"], output_path)
-
-        # Check for base64 response
-        if "b64_json" in first_item:
-            return save_base64_content(first_item["b64_json"], output_path)
-
-        raise ValidationError("Response contains neither URL nor base64 data")
+        return io.BytesIO(decode_base64_content(first_item["b64_json"]))
@@ -2,15 +2,12 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from ..exceptions import ValidationError
 from ..utils import (
     close_file_handles,
-    download_file,
     prepare_multiple_images,
-    save_base64_content,
+    save_generation_output,
     validate_prompt,
 )
 
@@ -97,7 +94,7 @@ class VideoGenerator:
 
         # Handle output file saving
         if output_path:
-            self._save_output(result, output_path)
+            save_generation_output(result, output_path)
 
         return result
 
@@ -165,35 +162,9 @@ class VideoGenerator:
 
             # Handle output file saving
             if output_path:
-                self._save_output(result, output_path)
+                save_generation_output(result, output_path)
 
             return result
 
         finally:
             close_file_handles(file_tuples)
-
-    def _save_output(self, result: dict[str, Any], output_path: str) -> Path:
-        """Save generation output to local file.
-
-        Args:
-            result: API response dict.
-            output_path: Local path to save to.
-
-        Returns:
-            Path to the saved file.
-        """
-        data = result.get("data", [])
-        if not data:
-            raise ValidationError("No output data in response")
-
-        first_item = data[0]
-
-        # Check for URL response
-        if "url" in first_item:
-            return download_file(first_item["url"], output_path)
-
-        # Check for base64 response
-        if "b64_json" in first_item:
-            return save_base64_content(first_item["b64_json"], output_path)
-
-        raise ValidationError("Response contains neither URL nor base64 data")
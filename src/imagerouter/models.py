@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 from .exceptions import ModelNotFoundError
@@ -11,7 +14,12 @@ if TYPE_CHECKING:
     from .client import ImageRouterClient
 
 
-@dataclass
+def _intern(value: Any) -> Any:
+    """Intern strings repeated across models so they share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class PricingInfo:
     """Pricing information for a model.
 
@@ -39,7 +47,7 @@ class PricingInfo:
         Returns:
             PricingInfo instance.
         """
-        pricing_type = pricing_data.get("type", "unknown")
+        pricing_type = _intern(pricing_data.get("type", "unknown"))
 
         if pricing_type == "fixed":
             value = float(pricing_data.get("value", 0))
@@ -75,7 +83,7 @@ class PricingInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelInfo:
     """Information about an available model.
 
@@ -117,7 +125,7 @@ class ModelInfo:
         return cls(
             id=data.get("id", ""),
             name=data.get("name", data.get("id", "")),
-            provider=data.get("provider", "unknown"),
+            provider=_intern(data.get("provider", "unknown")),
             output_types=data.get("output", []),
             pricing=PricingInfo.from_api_data(pricing_data),
             supported_durations=data.get("seconds"),
@@ -161,19 +169,56 @@ class ModelRegistry:
 
     def __init__(self, client: "ImageRouterClient") -> None:
         self._client = client
-        self._models: dict[str, ModelInfo] | None = None
+        self._raw_models: dict[str, Any] | None = None
+        # ModelInfo objects are parsed on first use, so looking up a single
+        # model does not pay for converting the whole catalogue.
+        self._models: dict[str, ModelInfo] = {}
+        # Read-only views per output type (None for all), built once per load
+        self._views: dict[str | None, Mapping[str, ModelInfo]] = {}
 
     def _ensure_loaded(self) -> None:
         """Ensure models are loaded from API."""
-        if self._models is None:
-            self.refresh()
+        if self._raw_models is None:
+            self._load()
+
+    def _load(self, revalidate: bool = False) -> None:
+        """Load model data from the client.
+
+        Args:
+            revalidate: Bypass the client's model list cache TTL.
+        """
+        models = self._client.list_models(revalidate=revalidate)
+        # Interned IDs let lookups with interned keys match on identity
+        self._raw_models = {_intern(model_id): data for model_id, data in models.items()}
+        self._models = {}
+        self._views = {}
+
+    def _get_info(self, model_id: str, data: dict[str, Any]) -> ModelInfo:
+        """Get the parsed ModelInfo for raw model data, parsing it once."""
+        info = self._models.get(model_id)
+        if info is None:
+            info = self._models[model_id] = ModelInfo.from_api_data(data)
+        return info
+
+    def _select(self, output_type: str | None = None) -> Mapping[str, ModelInfo]:
+        """Get a read-only view of models, optionally filtered by output type."""
+        self._ensure_loaded()
+        assert self._raw_models is not None
+
+        view = self._views.get(output_type)
+        if view is None:
+            view = self._views[output_type] = MappingProxyType(
+                {
+                    model_id: self._get_info(model_id, data)
+                    for model_id, data in self._raw_models.items()
+                    if output_type is None or output_type in data.get("output", ())
+                }
+            )
+        return view
 
     def refresh(self) -> None:
         """Refresh model data from API."""
-        raw_models = self._client.list_models()
-        self._models = {}
-        for model_id, data in raw_models.items():
-            self._models[model_id] = ModelInfo.from_api_data(data)
+        self._load(revalidate=True)
 
     def get_model(self, model_id: str) -> ModelInfo:
         """Get model information by ID.
@@ -188,50 +233,45 @@ class ModelRegistry:
             ModelNotFoundError: If the model is not found.
         """
         self._ensure_loaded()
-        assert self._models is not None
+        assert self._raw_models is not None
 
-        if model_id not in self._models:
+        data = self._raw_models.get(model_id)
+        if data is None:
             raise ModelNotFoundError(f"Model '{model_id}' not found")
-        return self._models[model_id]
+        return self._get_info(model_id, data)
 
-    def get_all_models(self) -> dict[str, ModelInfo]:
+    def get_all_models(self) -> Mapping[str, ModelInfo]:
         """Get all available models.
 
         Returns:
-            Dict mapping model_id to ModelInfo.
+            Read-only mapping of model_id to ModelInfo.
         """
-        self._ensure_loaded()
-        assert self._models is not None
-        return self._models.copy()
+        return self._select()
 
-    def get_video_models(self) -> dict[str, ModelInfo]:
+    def get_video_models(self) -> Mapping[str, ModelInfo]:
         """Get all video generation models.
 
         Returns:
-            Dict mapping model_id to ModelInfo for video models.
+            Read-only mapping of model_id to ModelInfo for video models.
         """
-        self._ensure_loaded()
-        assert self._models is not None
-        return {k: v for k, v in self._models.items() if v.is_video_model()}
+        return self._select("video")
 
-    def get_image_models(self) -> dict[str, ModelInfo]:
+    def get_image_models(self) -> Mapping[str, ModelInfo]:
         """Get all image generation models.
 
         Returns:
-            Dict mapping model_id to ModelInfo for image models.
+            Read-only mapping of model_id to ModelInfo for image models.
         """
-        self._ensure_loaded()
-        assert self._models is not None
-        return {k: v for k, v in self._models.items() if v.is_image_model()}
+        return self._select("image")
 
-    def get_models_by_type(self, output_type: str) -> dict[str, ModelInfo]:
+    def get_models_by_type(self, output_type: str) -> Mapping[str, ModelInfo]:
         """Get models by output type.
 
         Args:
             output_type: Either 'image' or 'video'.
 
         Returns:
-            Dict mapping model_id to ModelInfo.
+            Read-only mapping of model_id to ModelInfo.
         """
         if output_type == "video":
             return self.get_video_models()
@@ -4,13 +4,33 @@ from __future__ import annotations
 
 import base64
 import mimetypes
+import os
+import re
+import shutil
+import stat
+import time
+from collections.abc import Callable
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
 
 from .exceptions import NetworkError, ValidationError
 
+# pybase64 is an optional, SIMD-accelerated decoder. It is not a drop-in:
+# it rejects some misplaced padding the stdlib decoder skips, so it is only
+# given payloads already normalised to canonical base64.
+_b64decode_canonical: Callable[[str], bytes]
+try:
+    import pybase64
+
+    _b64decode_canonical = pybase64.b64decode
+except ImportError:  # pragma: no cover - depends on installed extras
+    _b64decode_canonical = base64.b64decode
+
 # Supported image formats for upload
 SUPPORTED_IMAGE_FORMATS = {
     ".jpg": "image/jpeg",
@@ -26,6 +46,61 @@ SUPPORTED_VIDEO_FORMATS = {
     ".webm": "video/webm",
 }
 
+# Combined lookup for get_mime_type
+_KNOWN_MIME_TYPES = {**SUPPORTED_IMAGE_FORMATS, **SUPPORTED_VIDEO_FORMATS}
+
+# Default output extension per generation type
+DEFAULT_OUTPUT_EXTENSIONS = {
+    "video": ".mp4",
+    "image": ".png",
+}
+
+# Base64 text decoded per write; a multiple of 4 so no chunk splits a quantum
+BASE64_CHUNK_SIZE = 1024 * 1024
+
+# Buffer size for copying downloaded content to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Downloads are idempotent GETs, so transient server errors are retried too
+DOWNLOAD_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    backoff_jitter=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_NON_BASE64_RE = re.compile(r"[^A-Za-z0-9+/=]")
+
+# Shared session for output downloads, created on first use. Kept separate from
+# the API client's session so its Authorization header never reaches storage hosts.
+_download_session: requests.Session | None = None
+
+
+def _get_download_session() -> requests.Session:
+    """Get the shared download session, creating it on first use."""
+    global _download_session
+    if _download_session is None:
+        _download_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=DOWNLOAD_RETRY)
+        _download_session.mount("https://", adapter)
+        _download_session.mount("http://", adapter)
+    return _download_session
+
+
+def close_download_session() -> None:
+    """Close the shared download session and release pooled connections."""
+    global _download_session
+    if _download_session is not None:
+        _download_session.close()
+        _download_session = None
+
+
+# Module-level indirection so tests can fake the filesystem for path checks
+# without replacing os.stat for the whole process
+_stat = os.stat
+
 
 def validate_image_path(path: str) -> Path:
     """Validate that a file path points to a supported image.
@@ -41,10 +116,13 @@ def validate_image_path(path: str) -> Path:
     """
     file_path = Path(path)
 
-    if not file_path.exists():
-        raise ValidationError(f"Image file not found: {path}")
+    # One stat call answers both the existence and the regular-file check
+    try:
+        mode = _stat(file_path).st_mode
+    except (FileNotFoundError, NotADirectoryError):
+        raise ValidationError(f"Image file not found: {path}") from None
 
-    if not file_path.is_file():
+    if not stat.S_ISREG(mode):
         raise ValidationError(f"Path is not a file: {path}")
 
     suffix = file_path.suffix.lower()
@@ -67,14 +145,10 @@ def get_mime_type(path: str | Path) -> str:
         MIME type string.
     """
     path = Path(path)
-    suffix = path.suffix.lower()
-
-    if suffix in SUPPORTED_IMAGE_FORMATS:
-        return SUPPORTED_IMAGE_FORMATS[suffix]
-    if suffix in SUPPORTED_VIDEO_FORMATS:
-        return SUPPORTED_VIDEO_FORMATS[suffix]
-
-    mime_type, _ = mimetypes.guess_type(str(path))
+    mime_type = _KNOWN_MIME_TYPES.get(path.suffix.lower())
+    if mime_type is None:
+        # Falls back to the system MIME database, loaded on first use
+        mime_type, _ = mimetypes.guess_type(path.name)
     return mime_type or "application/octet-stream"
 
 
@@ -115,7 +189,18 @@ def prepare_multiple_images(
     if len(paths) > 16:
         raise ValidationError("Maximum 16 images allowed per request")
 
-    return [prepare_image_for_upload(p) for p in paths]
+    # Validate every path before opening anything, so a bad path late in
+    # the list fails without leaving earlier handles open
+    validated = [validate_image_path(p) for p in paths]
+
+    files: list[tuple[str, BinaryIO, str]] = []
+    try:
+        for file_path in validated:
+            files.append((file_path.name, open(file_path, "rb"), get_mime_type(file_path)))
+    except BaseException:
+        close_file_handles(files)
+        raise
+    return files
 
 
 def close_file_handles(files: list[tuple[str, BinaryIO, str]]) -> None:
@@ -153,19 +238,42 @@ def download_file(url: str, output_path: str, timeout: int = 60) -> Path:
         raise ValidationError(f"Output directory does not exist: {out_path.parent}")
 
     try:
-        response = requests.get(url, timeout=timeout, stream=True)
-        response.raise_for_status()
+        with _get_download_session().get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
 
-        with open(out_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            # Copy straight from the socket; decode_content undoes any gzip encoding
+            response.raw.decode_content = True
+            with open(out_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
 
         return out_path.resolve()
 
-    except requests.exceptions.RequestException as e:
+    # Reading response.raw directly surfaces urllib3 errors unwrapped by requests
+    except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
         raise NetworkError(f"Failed to download file: {e}") from e
 
 
+def _decoded_size(data: str) -> int:
+    """Return the number of bytes a padded base64 string decodes to."""
+    return len(data) // 4 * 3 - data.endswith("=") - data.endswith("==")
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve disk space for a file up front where the platform supports it.
+
+    Args:
+        fd: Open file descriptor.
+        size: Final file size in bytes.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        # Not supported by every filesystem; writing still works without it
+        pass
+
+
 def save_base64_content(data: str, output_path: str) -> Path:
     """Save base64-encoded content to a file.
 
@@ -185,16 +293,100 @@ def save_base64_content(data: str, output_path: str) -> Path:
     if out_path.parent and not out_path.parent.exists():
         raise ValidationError(f"Output directory does not exist: {out_path.parent}")
 
+    # b64decode skips characters outside the alphabet (line breaks included);
+    # drop them up front so chunk boundaries stay on the 4-character grid
+    if _NON_BASE64_RE.search(data):
+        data = _NON_BASE64_RE.sub("", data)
+
+    # Validate the padding the way b64decode does and rewrite the payload in
+    # canonical form, so a bad payload is rejected before the output file is
+    # created and chunked decoding gives exactly what one b64decode call would
+    encoded = data.rstrip("=")
+    if "=" in encoded:
+        # Padding inside the data ends or skips groups in ways only a single
+        # b64decode call reproduces, so decode this rare case in memory
+        try:
+            decoded: bytes | None = base64.b64decode(data)
+        except Exception as e:
+            raise ValidationError(f"Failed to decode base64 content: {e}") from e
+    else:
+        decoded = None
+        remainder = len(encoded) % 4
+        if remainder == 1 or len(data) - len(encoded) < (4 - remainder) % 4:
+            raise ValidationError(
+                "Failed to decode base64 content: truncated payload (incorrect padding)"
+            )
+        data = encoded + "=" * ((4 - remainder) % 4)
+
     try:
-        decoded = base64.b64decode(data)
-        with open(out_path, "wb") as f:
-            f.write(decoded)
+        with open(out_path, "wb", buffering=0) as f:
+            if decoded is not None:
+                f.write(decoded)
+            else:
+                # Decode in chunks so the full decoded payload is never held
+                # in memory. Chunks are large, so the file is unbuffered to
+                # skip an extra copy.
+                _preallocate(f.fileno(), _decoded_size(data))
+                for start in range(0, len(data), BASE64_CHUNK_SIZE):
+                    f.write(_b64decode_canonical(data[start : start + BASE64_CHUNK_SIZE]))
         return out_path.resolve()
 
     except Exception as e:
+        out_path.unlink(missing_ok=True)
         raise ValidationError(f"Failed to decode base64 content: {e}") from e
 
 
+def decode_base64_content(data: str) -> bytes:
+    """Decode base64-encoded content in memory.
+
+    Args:
+        data: Base64-encoded string.
+
+    Returns:
+        Decoded bytes.
+
+    Raises:
+        ValidationError: If data is invalid.
+    """
+    # Always the stdlib decoder, so lenient input decodes the same whether or
+    # not pybase64 is installed
+    try:
+        return base64.b64decode(data)
+    except Exception as e:
+        raise ValidationError(f"Failed to decode base64 content: {e}") from e
+
+
+def save_generation_output(result: dict[str, Any], output_path: str) -> Path:
+    """Save the first output of a generation response to a local file.
+
+    Args:
+        result: API response dict.
+        output_path: Local path to save to.
+
+    Returns:
+        Path to the saved file.
+
+    Raises:
+        ValidationError: If the response has no usable output.
+        NetworkError: If downloading a URL output fails.
+    """
+    data = result.get("data", [])
+    if not data:
+        raise ValidationError("No output data in response")
+
+    first_item = data[0]
+
+    # Check for URL response
+    if "url" in first_item:
+        return download_file(first_item["url"], output_path)
+
+    # Check for base64 response
+    if "b64_json" in first_item:
+        return save_base64_content(first_item["b64_json"], output_path)
+
+    raise ValidationError("Response contains neither URL nor base64 data")
+
+
 def infer_output_extension(generation_type: str, output_path: str | None = None) -> str:
     """Infer the appropriate file extension for output.
 
@@ -210,9 +402,7 @@ def infer_output_extension(generation_type: str, output_path: str | None = None)
         if ext:
             return ext
 
-    if generation_type == "video":
-        return ".mp4"
-    return ".png"
+    return DEFAULT_OUTPUT_EXTENSIONS.get(generation_type, ".png")
 
 
 def ensure_output_path(
@@ -239,8 +429,6 @@ def ensure_output_path(
         return path
 
     # Auto-generate filename
-    import time
-
     timestamp = int(time.time())
     model_safe = model.replace("/", "_").replace(":", "_")
     ext = infer_output_extension(generation_type)
@@ -260,11 +448,12 @@ def validate_prompt(prompt: str, max_length: int = 10000) -> str:
     Raises:
         ValidationError: If prompt is empty or too long.
     """
-    if not prompt or not prompt.strip():
+    # strip() hands back the same object when there is nothing to remove,
+    # so already-clean prompts are not copied
+    cleaned = prompt.strip() if prompt else ""
+    if not cleaned:
         raise ValidationError("Prompt cannot be empty")
 
-    cleaned = prompt.strip()
-
     if len(cleaned) > max_length:
         raise ValidationError(
             f"Prompt too long ({len(cleaned)} chars). Maximum is {max_length} characters."
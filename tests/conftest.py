@@ -0,0 +1,96 @@
+"""Shared pytest fixtures.
+
+Mock data is imported inside each fixture, so runs that select no test
+needing it (e.g. ``pytest -k``) never load the fixture module.
+"""
+
+from types import MappingProxyType
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mock_models_response():
+    """Mock /v1/models response."""
+    from .fixtures import MOCK_MODELS_RESPONSE
+
+    return MOCK_MODELS_RESPONSE
+
+
+@pytest.fixture(scope="session")
+def mock_models_by_id(mock_models_response):
+    """Mock models keyed by ID, as returned by ImageRouterClient.list_models."""
+    return MappingProxyType({model["id"]: model for model in mock_models_response["data"]})
+
+
+@pytest.fixture(scope="session")
+def parsed_models(mock_models_response):
+    """Mock models parsed into ModelInfo once per session, keyed by ID."""
+    from imagerouter.models import ModelInfo
+
+    return MappingProxyType(
+        {model["id"]: ModelInfo.from_api_data(model) for model in mock_models_response["data"]}
+    )
+
+
+@pytest.fixture(scope="session")
+def expected_video_ids(mock_models_response):
+    """IDs of the mock models that output video."""
+    return frozenset(
+        model["id"] for model in mock_models_response["data"] if "video" in model.get("output", [])
+    )
+
+
+@pytest.fixture(scope="session")
+def expected_image_ids(mock_models_response):
+    """IDs of the mock models that output images."""
+    return frozenset(
+        model["id"] for model in mock_models_response["data"] if "image" in model.get("output", [])
+    )
+
+
+@pytest.fixture
+def mock_client_with_models(mock_models_by_id):
+    """Mock client whose list_models returns the shared mock models."""
+    mock_client = MagicMock()
+    mock_client.list_models.return_value = mock_models_by_id
+    return mock_client
+
+
+@pytest.fixture
+def mock_client():
+    """Mock ImageRouterClient with no configured responses."""
+    return MagicMock()
+
+
+@pytest.fixture(scope="session")
+def mock_models_response_bytes():
+    """Mock /v1/models response body, serialized once."""
+    from .fixtures import MOCK_MODELS_RESPONSE_BYTES
+
+    return MOCK_MODELS_RESPONSE_BYTES
+
+
+@pytest.fixture(scope="session")
+def mock_credits_response_bytes():
+    """Mock /v1/credits response body, serialized once."""
+    from .fixtures import MOCK_CREDITS_RESPONSE_BYTES
+
+    return MOCK_CREDITS_RESPONSE_BYTES
+
+
+@pytest.fixture(scope="session")
+def mock_video_generation_response():
+    """Mock video generation response."""
+    from .fixtures import MOCK_VIDEO_GENERATION_RESPONSE
+
+    return MOCK_VIDEO_GENERATION_RESPONSE
+
+
+@pytest.fixture(scope="session")
+def mock_image_generation_response():
+    """Mock image generation response."""
+    from .fixtures import MOCK_IMAGE_GENERATION_RESPONSE
+
+    return MOCK_IMAGE_GENERATION_RESPONSE
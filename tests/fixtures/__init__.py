@@ -3,15 +3,19 @@
 from .mock_responses import (
     MOCK_AUTH_TEST_RESPONSE,
     MOCK_CREDITS_RESPONSE,
+    MOCK_CREDITS_RESPONSE_BYTES,
     MOCK_IMAGE_GENERATION_RESPONSE,
     MOCK_MODELS_RESPONSE,
+    MOCK_MODELS_RESPONSE_BYTES,
     MOCK_VIDEO_GENERATION_RESPONSE,
     get_mock_model_by_id,
 )
 
 __all__ = [
     "MOCK_MODELS_RESPONSE",
+    "MOCK_MODELS_RESPONSE_BYTES",
     "MOCK_CREDITS_RESPONSE",
+    "MOCK_CREDITS_RESPONSE_BYTES",
     "MOCK_VIDEO_GENERATION_RESPONSE",
     "MOCK_IMAGE_GENERATION_RESPONSE",
     "MOCK_AUTH_TEST_RESPONSE",
@@ -0,0 +1,134 @@
+"""Tests for the command-line interface."""
+
+import argparse
+from importlib import metadata
+from unittest.mock import patch
+
+import pytest
+
+from imagerouter import __version__
+from imagerouter.cli import SUBCOMMANDS, _sniff_subcommand, cmd_models, create_parser, main
+
+
+class TestSniffSubcommand:
+    """Tests for subcommand detection."""
+
+    def test_known_subcommand(self):
+        """Test detection of a known subcommand."""
+        assert _sniff_subcommand(["models", "--type", "video"]) == "models"
+
+    def test_no_arguments(self):
+        """Test empty argument list."""
+        assert _sniff_subcommand([]) is None
+
+    def test_help_before_subcommand(self):
+        """Test top-level help is not treated as a subcommand."""
+        assert _sniff_subcommand(["--help", "estimate"]) is None
+
+    def test_unknown_subcommand(self):
+        """Test unknown first argument."""
+        assert _sniff_subcommand(["bogus"]) is None
+
+
+class TestCreateParser:
+    """Tests for parser construction."""
+
+    def test_full_parser(self):
+        """Test full parser has all subcommands."""
+        parser = create_parser()
+        argv_by_command = {
+            "estimate": ["estimate", "--type", "video", "--model", "m"],
+            "generate": [
+                "generate",
+                "--execute",
+                "--type",
+                "image",
+                "--model",
+                "m",
+                "--prompt",
+                "p",
+            ],
+            "models": ["models"],
+            "credits": ["credits"],
+        }
+        for name in SUBCOMMANDS:
+            args = parser.parse_args(argv_by_command[name])
+            assert args.command == name
+
+    def test_single_subcommand_parser(self):
+        """Test parser built for one subcommand."""
+        parser = create_parser("credits")
+        args = parser.parse_args(["credits", "--json"])
+        assert args.command == "credits"
+        assert args.json
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["models"])
+
+    def test_parser_is_cached(self):
+        """Test repeated calls reuse the same parser."""
+        assert create_parser("models") is create_parser("models")
+        assert create_parser("models") is not create_parser()
+
+
+class TestMain:
+    """Tests for the CLI entry point."""
+
+    @pytest.mark.parametrize("flag", ["-V", "--version"])
+    def test_version(self, flag, monkeypatch, capsys):
+        """Test version output."""
+        monkeypatch.setattr("sys.argv", ["imagerouter", flag])
+
+        with pytest.raises(SystemExit) as exc:
+            main()
+
+        assert exc.value.code == 0
+        assert capsys.readouterr().out == f"imagerouter {__version__}\n"
+
+    def test_version_matches_package_metadata(self):
+        """Test the reported version is the one the package is built with."""
+        try:
+            installed = metadata.version("imagerouter")
+        except metadata.PackageNotFoundError:
+            pytest.skip("imagerouter is not installed")
+        assert __version__ == installed
+
+    def test_version_via_parser(self, capsys):
+        """Test the parser reports the same version."""
+        with pytest.raises(SystemExit):
+            create_parser().parse_args(["--version"])
+        assert capsys.readouterr().out == f"imagerouter {__version__}\n"
+
+
+class TestCmdModels:
+    """Tests for the models command."""
+
+    @patch("imagerouter.client.ImageRouterClient")
+    def test_text_listing(self, mock_client_cls, capsys, mock_models_by_id):
+        """Test the human-readable model listing."""
+        client = mock_client_cls.return_value.__enter__.return_value
+        client.list_models.return_value = mock_models_by_id
+
+        args = argparse.Namespace(type="video", json=False, no_cache=False)
+        assert cmd_models(args) == 0
+
+        assert capsys.readouterr().out == (
+            "Available video models:\n"
+            "\n"
+            "  google/veo-3.1-fast\n"
+            "    Provider: Gemini\n"
+            "    Price: $0.60 - $1.20\n"
+            "    Durations: [4, 6, 8]s\n"
+            "\n"
+            "  ir/test-video\n"
+            "    Provider: Test\n"
+            "    Price: $0.00\n"
+            "    Durations: [5]s\n"
+            "\n"
+            "  kwaivgi/kling-2.1-standard\n"
+            "    Provider: Runware\n"
+            "    Price: $0.18 - $0.37\n"
+            "    Durations: [5, 10]s\n"
+            "    Supports edit: Yes\n"
+            "\n"
+        )
@@ -1,76 +1,121 @@
 """Tests for the ImageRouter client."""
 
+import io
+import itertools
+import os
+from pathlib import Path
+
+import orjson
 import pytest
-from unittest.mock import MagicMock, patch
+import requests
+from unittest.mock import patch
+from urllib3 import HTTPResponse
 
-from imagerouter.client import ImageRouterClient, BASE_URL
+from imagerouter.client import BASE_URL, USER_AGENT, ImageRouterClient, _MultipartBody
 from imagerouter.exceptions import (
     AuthenticationError,
     GenerationError,
+    InsufficientCreditsError,
     ModelNotFoundError,
+    NetworkError,
     RateLimitError,
     ValidationError,
 )
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from fixtures.mock_responses import (
-    MOCK_CREDITS_RESPONSE,
-    MOCK_MODELS_RESPONSE,
-)
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the model list cache out of the user's home directory."""
+    monkeypatch.setenv("IMAGEROUTER_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+class FakeResponse:
+    """Stand-in for requests.Response with just the attributes the client reads."""
+
+    __slots__ = ("status_code", "headers", "content", "text")
+
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+        self.text = content.decode("utf-8", "replace")
+
+
+def _make_response(status_code=200, payload=None, headers=None):
+    """Build an HTTP response carrying a JSON payload."""
+    # Shared fixtures are read-only mapping proxies, which orjson serializes via dict
+    return FakeResponse(status_code, orjson.dumps(payload, default=dict), headers)
+
+
+def _make_raw_response(status_code, payload, headers=None):
+    """Build a urllib3 response as returned below the adapter's retry loop."""
+    return HTTPResponse(
+        body=io.BytesIO(orjson.dumps(payload)),
+        status=status_code,
+        headers=headers or {},
+        preload_content=False,
+    )
+
+
+@pytest.fixture
+def mock_request():
+    """Patch the session transport so no request leaves the process."""
+    with patch("imagerouter.client.requests.Session.request") as mock:
+        yield mock
 
 
 class TestImageRouterClientInit:
     """Tests for client initialization."""
 
-    def test_init_with_api_key(self):
-        """Test initialization with explicit API key."""
-        client = ImageRouterClient(api_key="test_key")
-        assert client.api_key == "test_key"
-
-    def test_init_from_env(self):
-        """Test initialization from environment variable."""
-        with patch.dict("os.environ", {"IMAGEROUTER_API_KEY": "env_key"}):
-            client = ImageRouterClient()
-            assert client.api_key == "env_key"
+    @pytest.mark.parametrize(
+        "kwargs,env,attr,expected",
+        [
+            ({"api_key": "test_key"}, {}, "api_key", "test_key"),
+            ({}, {"IMAGEROUTER_API_KEY": "env_key"}, "api_key", "env_key"),
+            ({"api_key": "test", "timeout": 600}, {}, "timeout", 600),
+            ({"api_key": "test", "max_retries": 5}, {}, "max_retries", 5),
+            ({}, {"IMAGEROUTER_API_KEY": "test", "IMAGEROUTER_TIMEOUT": "120"}, "timeout", 120),
+        ],
+    )
+    def test_init_options(self, kwargs, env, attr, expected):
+        """Test options from arguments and environment variables."""
+        with patch.dict("os.environ", env):
+            client = ImageRouterClient(**kwargs)
+        assert getattr(client, attr) == expected
 
     def test_init_no_key(self):
         """Test initialization without API key raises error."""
         with patch.dict("os.environ", {}, clear=True):
-            with pytest.raises(AuthenticationError) as exc:
+            with pytest.raises(AuthenticationError, match="API key is required"):
+                ImageRouterClient()
+
+    def test_init_skips_dotenv_with_key(self):
+        """Test .env is not searched when a key is already available."""
+        with patch("dotenv.load_dotenv") as mock_load:
+            ImageRouterClient(api_key="test")
+            with patch.dict("os.environ", {"IMAGEROUTER_API_KEY": "env_key"}):
                 ImageRouterClient()
-            assert "API key is required" in str(exc.value)
+        mock_load.assert_not_called()
 
-    def test_init_custom_timeout(self):
-        """Test initialization with custom timeout."""
-        client = ImageRouterClient(api_key="test", timeout=600)
-        assert client.timeout == 600
+    def test_init_loads_dotenv_without_key(self):
+        """Test .env is loaded when no key is configured."""
 
-    def test_init_custom_retries(self):
-        """Test initialization with custom retries."""
-        client = ImageRouterClient(api_key="test", max_retries=5)
-        assert client.max_retries == 5
+        def load_key():
+            os.environ["IMAGEROUTER_API_KEY"] = "dotenv_key"
 
-    def test_init_from_env_timeout(self):
-        """Test timeout from environment variable."""
-        with patch.dict("os.environ", {
-            "IMAGEROUTER_API_KEY": "test",
-            "IMAGEROUTER_TIMEOUT": "120"
-        }):
-            client = ImageRouterClient()
-            assert client.timeout == 120
+        with patch.dict("os.environ", {}, clear=True):
+            with patch("dotenv.load_dotenv", side_effect=load_key):
+                client = ImageRouterClient()
+        assert client.api_key == "dotenv_key"
 
 
 class TestImageRouterClientRequests:
     """Tests for client HTTP requests."""
 
-    @patch("imagerouter.client.requests.request")
-    def test_list_models(self, mock_request):
+    def test_list_models(self, mock_request, mock_models_response_bytes):
         """Test listing models."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = MOCK_MODELS_RESPONSE
-        mock_request.return_value = mock_response
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes)
 
         client = ImageRouterClient(api_key="test")
         models = client.list_models()
@@ -79,13 +124,9 @@ class TestImageRouterClientRequests:
         assert "openai/gpt-image-1" in models
         mock_request.assert_called_once()
 
-    @patch("imagerouter.client.requests.request")
-    def test_list_models_filter_video(self, mock_request):
+    def test_list_models_filter_video(self, mock_request, mock_models_response_bytes):
         """Test listing models with video filter."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = MOCK_MODELS_RESPONSE
-        mock_request.return_value = mock_response
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes)
 
         client = ImageRouterClient(api_key="test")
         models = client.list_models(output_type="video")
@@ -93,13 +134,9 @@ class TestImageRouterClientRequests:
         assert "google/veo-3.1-fast" in models
         assert "openai/gpt-image-1" not in models
 
-    @patch("imagerouter.client.requests.request")
-    def test_get_credits(self, mock_request):
+    def test_get_credits(self, mock_request, mock_credits_response_bytes):
         """Test getting credits."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = MOCK_CREDITS_RESPONSE
-        mock_request.return_value = mock_response
+        mock_request.return_value = FakeResponse(200, mock_credits_response_bytes)
 
         client = ImageRouterClient(api_key="test")
         credits = client.get_credits()
@@ -107,108 +144,285 @@ class TestImageRouterClientRequests:
         assert credits["remaining_credits"] == 50.00
         assert credits["credit_usage"] == 25.50
 
-    @patch("imagerouter.client.requests.request")
     def test_test_auth(self, mock_request):
         """Test auth validation."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "ok"}
-        mock_request.return_value = mock_response
+        mock_request.return_value = _make_response(payload={"status": "ok"})
 
         client = ImageRouterClient(api_key="test")
         result = client.test_auth()
 
         assert result is True
 
-    @patch("imagerouter.client.requests.request")
-    def test_headers(self, mock_request):
-        """Test request headers."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"data": []}
-        mock_request.return_value = mock_response
-
+    def test_headers(self):
+        """Test session headers."""
         client = ImageRouterClient(api_key="my_api_key")
+
+        assert client._session.headers["Authorization"] == "Bearer my_api_key"
+        assert client._session.headers["User-Agent"] == USER_AGENT
+
+    def test_session_reused(self, mock_request):
+        """Test that requests share one session."""
+        mock_request.return_value = _make_response(payload={"data": []})
+
+        client = ImageRouterClient(api_key="test")
+        session = client._session
         client.list_models()
+        client.get_credits()
 
-        call_kwargs = mock_request.call_args[1]
-        assert "Authorization" in call_kwargs["headers"]
-        assert call_kwargs["headers"]["Authorization"] == "Bearer my_api_key"
+        assert client._session is session
+        assert mock_request.call_count == 2
+
+    def test_context_manager_closes_session(self):
+        """Test that exiting the context closes the session."""
+        with patch("imagerouter.client.requests.Session.close") as mock_close:
+            with ImageRouterClient(api_key="test"):
+                pass
+        mock_close.assert_called_once()
 
 
 class TestImageRouterClientErrors:
     """Tests for client error handling."""
 
-    @patch("imagerouter.client.requests.request")
-    def test_authentication_error(self, mock_request):
-        """Test 401 error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"error": {"message": "Invalid API key"}}
-        mock_request.return_value = mock_response
+    @pytest.mark.parametrize(
+        "status_code,message,exc_cls,method,args",
+        [
+            (401, "Invalid API key", AuthenticationError, "list_models", ()),
+            (400, "Invalid parameter", ValidationError, "post_json", ("/v1/test", {"bad": "x"})),
+            (404, "Model not found", ModelNotFoundError, "post_json", ("/v1/test", {})),
+            (500, "Internal error", GenerationError, "list_models", ()),
+        ],
+    )
+    def test_status_code_errors(self, mock_request, status_code, message, exc_cls, method, args):
+        """Test HTTP error statuses map to the matching exception."""
+        mock_request.return_value = _make_response(status_code, {"error": {"message": message}})
 
-        client = ImageRouterClient(api_key="bad_key")
+        client = ImageRouterClient(api_key="test")
 
-        with pytest.raises(AuthenticationError) as exc:
-            client.list_models()
-        assert exc.value.status_code == 401
+        with pytest.raises(exc_cls) as exc:
+            getattr(client, method)(*args)
+        assert exc.value.status_code == status_code
 
-    @patch("imagerouter.client.requests.request")
     def test_rate_limit_error(self, mock_request):
-        """Test 429 error handling with retry."""
-        mock_response_429 = MagicMock()
-        mock_response_429.status_code = 429
-        mock_response_429.headers = {"Retry-After": "1"}
-        mock_response_429.json.return_value = {"error": {"message": "Rate limit"}}
+        """Test 429 error handling once adapter retries are exhausted."""
+        mock_request.return_value = _make_response(
+            429, {"error": {"message": "Rate limit"}}, headers={"Retry-After": "1"}
+        )
 
-        mock_response_200 = MagicMock()
-        mock_response_200.status_code = 200
-        mock_response_200.json.return_value = {"data": []}
+        client = ImageRouterClient(api_key="test", max_retries=2)
 
-        mock_request.side_effect = [mock_response_429, mock_response_200]
+        with pytest.raises(RateLimitError) as exc:
+            client.list_models()
+        assert exc.value.status_code == 429
+
+    @pytest.mark.parametrize("rate_limited", [1, 2])
+    def test_rate_limit_retried_until_success(self, rate_limited):
+        """Test 429 responses are retried by the adapter before succeeding."""
+        rate_limit = _make_raw_response(
+            429, {"error": {"message": "Rate limit"}}, headers={"Retry-After": "1"}
+        )
+        ok = _make_raw_response(200, {"remaining_credits": 50.0})
+        responses = itertools.chain(itertools.repeat(rate_limit, rate_limited), [ok])
+
+        with (
+            patch(
+                "urllib3.connectionpool.HTTPConnectionPool._make_request", side_effect=responses
+            ) as mock_make_request,
+            patch("urllib3.util.retry.time.sleep") as mock_sleep,
+        ):
+            client = ImageRouterClient(api_key="test", max_retries=3)
+            credits = client.get_credits()
+
+        assert credits == {"remaining_credits": 50.0}
+        assert mock_make_request.call_count == rate_limited + 1
+        assert [c.args for c in mock_sleep.call_args_list] == [(1.0,)] * rate_limited
+
+    def test_retry_configuration(self):
+        """Test retries are delegated to the mounted adapter."""
+        client = ImageRouterClient(api_key="test", max_retries=3)
+        retry = client._session.get_adapter(BASE_URL).max_retries
+
+        assert retry.total == 2
+        assert retry.respect_retry_after_header
+        assert retry.is_retry("POST", 429)
+        assert retry.is_retry("GET", 503)
+        assert not retry.is_retry("POST", 503)
+        assert not retry.is_retry("GET", 404)
+
+    def test_connection_error(self, mock_request):
+        """Test connection failures surface as NetworkError."""
+        mock_request.side_effect = requests.exceptions.ConnectionError("refused")
 
-        client = ImageRouterClient(api_key="test", max_retries=2)
-        result = client.list_models()
+        client = ImageRouterClient(api_key="test")
 
-        assert mock_request.call_count == 2
+        with pytest.raises(NetworkError):
+            client.get_credits()
 
-    @patch("imagerouter.client.requests.request")
-    def test_validation_error(self, mock_request):
-        """Test 400 error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {"error": {"message": "Invalid parameter"}}
-        mock_request.return_value = mock_response
+    def test_non_json_error_body(self, mock_request):
+        """Test error responses without a JSON body."""
+        mock_request.return_value = FakeResponse(502, b"Bad gateway")
+
+        client = ImageRouterClient(api_key="test")
+
+        with pytest.raises(GenerationError) as exc:
+            client.get_credits()
+        assert exc.value.message == "Bad gateway"
+
+    def test_insufficient_credits_error(self, mock_request):
+        """Test credit errors are detected from the message."""
+        mock_request.return_value = _make_response(
+            403, {"error": {"message": "Not enough Credits"}}
+        )
 
         client = ImageRouterClient(api_key="test")
 
-        with pytest.raises(ValidationError) as exc:
-            client.post_json("/v1/test", {"bad": "param"})
-        assert exc.value.status_code == 400
+        with pytest.raises(InsufficientCreditsError):
+            client.post_json("/v1/test", {})
 
-    @patch("imagerouter.client.requests.request")
-    def test_model_not_found_error(self, mock_request):
-        """Test 404 model error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.json.return_value = {"error": {"message": "Model not found"}}
+    def test_error_without_message_object(self, mock_request):
+        """Test error bodies whose 'error' field is not an object."""
+        mock_response = _make_response(404, {"error": "missing"})
+        mock_response.text = "Model foo/bar does not exist"
         mock_request.return_value = mock_response
 
         client = ImageRouterClient(api_key="test")
 
         with pytest.raises(ModelNotFoundError):
-            client.post_json("/v1/test", {"model": "bad/model"})
-
-    @patch("imagerouter.client.requests.request")
-    def test_generation_error(self, mock_request):
-        """Test 500 error handling."""
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.json.return_value = {"error": {"message": "Internal error"}}
-        mock_request.return_value = mock_response
+            client.post_json("/v1/test", {})
+
+
+class TestImageRouterClientModelsCache:
+    """Tests for the on-disk model list cache."""
+
+    def test_fresh_cache_skips_request(
+        self, mock_request, isolated_cache_dir, mock_models_response_bytes
+    ):
+        """Test that a fresh cache entry avoids the network."""
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes, {"ETag": '"v1"'})
 
+        ImageRouterClient(api_key="test").list_models()
         client = ImageRouterClient(api_key="test")
+        models = client.list_models()
 
-        with pytest.raises(GenerationError) as exc:
-            client.list_models()
-        assert exc.value.status_code == 500
+        assert "google/veo-3.1-fast" in models
+        assert mock_request.call_count == 1
+        assert client._models_cache_file().parent == isolated_cache_dir
+        assert client._models_cache_file().exists()
+
+    def test_cache_dir_follows_xdg(self, monkeypatch, tmp_path):
+        """Test the default cache directory honours XDG_CACHE_HOME."""
+        monkeypatch.delenv("IMAGEROUTER_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert ImageRouterClient(api_key="test").cache_dir == tmp_path / "imagerouter"
+
+    def test_no_home_disables_cache(self, mock_request, monkeypatch, mock_models_response_bytes):
+        """Test that without a home directory the model list is simply not cached."""
+        monkeypatch.delenv("IMAGEROUTER_CACHE_DIR")
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+
+        def no_home():
+            raise RuntimeError("Could not determine home directory.")
+
+        monkeypatch.setattr(Path, "home", no_home)
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes)
+
+        client = ImageRouterClient(api_key="test")
+        client.list_models()
+        client.list_models(revalidate=True)
+
+        assert client.cache_dir is None
+        assert mock_request.call_count == 2
+
+    def test_cache_is_per_base_url(self, mock_request, mock_models_response_bytes):
+        """Test that clients for different API endpoints do not share a cache entry."""
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes, {"ETag": '"v1"'})
+
+        ImageRouterClient(api_key="test").list_models()
+        client = ImageRouterClient(api_key="test")
+        client.base_url = "https://staging.imagerouter.io"
+        client.list_models()
+
+        assert mock_request.call_count == 2
+        assert mock_request.call_args[1]["headers"] is None
+
+    def test_stale_cache_revalidates_with_etag(self, mock_request, mock_models_response_bytes):
+        """Test that an expired entry is revalidated and reused on 304."""
+        mock_request.side_effect = [
+            FakeResponse(200, mock_models_response_bytes, {"ETag": '"v1"'}),
+            _make_response(304),
+        ]
+
+        ImageRouterClient(api_key="test").list_models()
+        client = ImageRouterClient(api_key="test", models_cache_ttl=0)
+        models = client.list_models(output_type="video")
+
+        assert "google/veo-3.1-fast" in models
+        assert mock_request.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_revalidate_replaces_changed_list(self, mock_request, mock_models_response_bytes):
+        """Test that a changed model list replaces the cache entry."""
+        mock_request.side_effect = [
+            FakeResponse(200, mock_models_response_bytes, {"ETag": '"v1"'}),
+            _make_response(payload={"data": []}, headers={"ETag": '"v2"'}),
+        ]
+
+        client = ImageRouterClient(api_key="test")
+        client.list_models()
+        assert client.list_models(revalidate=True) == {}
+        assert client.list_models() == {}
+        assert mock_request.call_count == 2
+
+    def test_corrupt_cache_is_ignored(self, mock_request, mock_models_response_bytes):
+        """Test that an unreadable cache falls back to the API."""
+        client = ImageRouterClient(api_key="test")
+        client._models_cache_file().write_text("not json")
+        mock_request.return_value = FakeResponse(200, mock_models_response_bytes)
+
+        models = client.list_models()
+
+        assert "openai/gpt-image-1" in models
+        assert mock_request.call_args[1]["headers"] is None
+
+
+class TestMultipartUpload:
+    """Tests for streaming multipart uploads."""
+
+    def test_body_streams_and_rewinds(self):
+        """Test that the body can be read again after rewinding."""
+        image = io.BytesIO(b"image-bytes")
+        body = _MultipartBody(
+            {"prompt": "hi", "seconds": 5}, {"image[0]": ("a.png", image, "image/png")}
+        )
+
+        first = body.read()
+        assert body.tell() == len(first) == body.len
+        assert b"image-bytes" in first
+        assert b'name="seconds"\r\n\r\n5' in first
+
+        body.seek(0)
+        assert body.read() == first
+
+    def test_none_fields_omitted(self):
+        """Test that None form values are left out instead of sent as "None"."""
+        image = io.BytesIO(b"image-bytes")
+        body = _MultipartBody(
+            {"prompt": "hi", "size": None}, {"image[0]": ("a.png", image, "image/png")}
+        )
+
+        content = body.read()
+        assert b'name="prompt"' in content
+        assert b'name="size"' not in content
+
+    def test_post_multipart(self, mock_request):
+        """Test multipart requests send a streaming body."""
+        mock_request.return_value = _make_response(payload={"data": []})
+
+        client = ImageRouterClient(api_key="test")
+        client.post_multipart(
+            "/v1/test", {"prompt": "hi"}, {"image[0]": ("a.png", io.BytesIO(b"x"), "image/png")}
+        )
+
+        call_kwargs = mock_request.call_args[1]
+        assert isinstance(call_kwargs["data"], _MultipartBody)
+        assert call_kwargs["files"] is None
+        assert call_kwargs["headers"]["Content-Type"].startswith("multipart/form-data")
@@ -7,9 +7,21 @@ from imagerouter.estimator import CostEstimate, CostEstimator
 from imagerouter.exceptions import ModelNotFoundError, ValidationError
 from imagerouter.models import ModelInfo, PricingInfo
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from fixtures.mock_responses import MOCK_MODELS_RESPONSE
+
+@pytest.fixture
+def cold_estimator(mock_client_with_models):
+    """Cost estimator that has not loaded any model data yet."""
+    return CostEstimator(mock_client_with_models)
+
+
+@pytest.fixture(scope="module")
+def estimator(mock_models_by_id):
+    """Cost estimator shared by read-only tests, with model data preloaded."""
+    mock_client = MagicMock()
+    mock_client.list_models.return_value = mock_models_by_id
+    warm = CostEstimator(mock_client)
+    warm.estimate_video(model="google/veo-3.1-fast", seconds=4)
+    return warm
 
 
 class TestCostEstimate:
@@ -77,56 +89,60 @@ class TestCostEstimate:
         assert "$0.60" in summary
         assert "$1.20" in summary
 
-
-class TestCostEstimator:
-    """Tests for CostEstimator class."""
-
-    def _create_mock_client(self):
-        """Create a mock client with model data."""
-        mock_client = MagicMock()
-        mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
-        }
-        return mock_client
-
-    def test_estimate_video(self):
-        """Test video cost estimation."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        estimate = estimator.estimate_video(
-            model="google/veo-3.1-fast",
-            seconds=4,
+    def test_immutable_and_hashable(self):
+        """Test estimates are frozen and can be deduplicated."""
+        kwargs = dict(
+            model="openai/gpt-image-1",
+            generation_type="image",
+            duration_seconds=None,
             count=1,
+            price_per_unit=0.15,
+            total_min=0.01,
+            total_max=0.30,
+            total_average=0.15,
         )
+        estimate = CostEstimate(**kwargs)
 
-        assert estimate.model == "google/veo-3.1-fast"
-        assert estimate.generation_type == "video"
-        assert estimate.duration_seconds == 4
-        assert estimate.count == 1
-        assert estimate.total_min == 0.60
-        assert estimate.total_max == 1.20
-
-    def test_estimate_video_multiple(self):
-        """Test video cost estimation for multiple outputs."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
+        with pytest.raises(AttributeError):
+            estimate.count = 2
+        assert not hasattr(estimate, "__dict__")
+        assert len({estimate, CostEstimate(**kwargs)}) == 1
 
-        estimate = estimator.estimate_video(
-            model="kwaivgi/kling-2.1-standard",
-            seconds=5,
-            count=3,
-        )
 
-        assert estimate.count == 3
-        assert estimate.total_min == 0.18 * 3
-        assert estimate.total_max == 0.37 * 3
+class TestCostEstimator:
+    """Tests for CostEstimator class."""
 
-    def test_estimate_video_default_duration(self):
+    @pytest.mark.parametrize(
+        "method,model,kwargs,expect_min,expect_max",
+        [
+            ("estimate_video", "google/veo-3.1-fast", {"seconds": 4, "count": 1}, 0.60, 1.20),
+            (
+                "estimate_video",
+                "kwaivgi/kling-2.1-standard",
+                {"seconds": 5, "count": 3},
+                0.18 * 3,
+                0.37 * 3,
+            ),
+            ("estimate_image", "openai/gpt-image-1", {"count": 1}, 0.01, 0.30),
+            ("estimate_image", "openai/gpt-image-1", {"count": 5}, 0.01 * 5, 0.30 * 5),
+            ("estimate_image", "openai/gpt-image-1.5:free", {"count": 10}, 0.0, 0.0),
+        ],
+    )
+    def test_estimates(self, estimator, method, model, kwargs, expect_min, expect_max):
+        """Test video and image cost estimates."""
+        estimate = getattr(estimator, method)(model=model, **kwargs)
+
+        assert estimate.model == model
+        assert estimate.generation_type == method.removeprefix("estimate_")
+        assert estimate.duration_seconds == kwargs.get("seconds")
+        assert estimate.count == kwargs["count"]
+        assert estimate.total_min == pytest.approx(expect_min)
+        assert estimate.total_max == pytest.approx(expect_max)
+        if expect_max == 0.0:
+            assert estimate.total_average == 0.0
+
+    def test_estimate_video_default_duration(self, estimator):
         """Test video estimation with default duration."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
         estimate = estimator.estimate_video(
             model="google/veo-3.1-fast",
             seconds=None,  # Should use first supported duration (4)
@@ -134,109 +150,74 @@ class TestCostEstimator:
 
         assert estimate.duration_seconds == 4
 
-    def test_estimate_video_invalid_duration(self):
+    def test_estimate_video_invalid_duration(self, estimator):
         """Test video estimation with invalid duration."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="not supported"):
             estimator.estimate_video(
                 model="google/veo-3.1-fast",
                 seconds=99,  # Not in [4, 6, 8]
             )
-        assert "not supported" in str(exc.value)
 
-    def test_estimate_video_wrong_model_type(self):
+    def test_estimate_video_wrong_model_type(self, estimator):
         """Test video estimation with image model."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="does not support video"):
             estimator.estimate_video(model="openai/gpt-image-1")
-        assert "does not support video" in str(exc.value)
 
-    def test_estimate_video_invalid_count(self):
+    def test_estimate_video_invalid_count(self, estimator):
         """Test video estimation with invalid count."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="at least 1"):
             estimator.estimate_video(
                 model="google/veo-3.1-fast",
                 seconds=4,
                 count=0,
             )
-        assert "at least 1" in str(exc.value)
 
-    def test_estimate_image(self):
-        """Test image cost estimation."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        estimate = estimator.estimate_image(
-            model="openai/gpt-image-1",
-            count=1,
+    def test_estimate_video_batch(self, mock_client_with_models, cold_estimator):
+        """Test batch video cost estimation."""
+        estimates = cold_estimator.estimate_video_batch(
+            [
+                {"model": "google/veo-3.1-fast", "seconds": 4},
+                {"model": "kwaivgi/kling-2.1-standard", "seconds": 10, "count": 2},
+                {"model": "google/veo-3.1-fast"},
+            ]
         )
 
-        assert estimate.model == "openai/gpt-image-1"
-        assert estimate.generation_type == "image"
-        assert estimate.duration_seconds is None
-        assert estimate.total_min == 0.01
-        assert estimate.total_max == 0.30
-
-    def test_estimate_image_multiple(self):
-        """Test image estimation for multiple outputs."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        estimate = estimator.estimate_image(
-            model="openai/gpt-image-1",
-            count=5,
-        )
-
-        assert estimate.count == 5
-        assert estimate.total_min == 0.01 * 5
-        assert estimate.total_max == 0.30 * 5
+        assert [e.model for e in estimates] == [
+            "google/veo-3.1-fast",
+            "kwaivgi/kling-2.1-standard",
+            "google/veo-3.1-fast",
+        ]
+        assert estimates[1].total_max == 0.37 * 2
+        assert estimates[2].duration_seconds == 4
+        mock_client_with_models.list_models.assert_called_once()
+
+    def test_estimate_video_batch_invalid(self, estimator):
+        """Test batch estimation fails on an invalid request."""
+        with pytest.raises(ValidationError, match="Duration 99s not supported"):
+            estimator.estimate_video_batch(
+                [
+                    {"model": "google/veo-3.1-fast", "seconds": 4},
+                    {"model": "google/veo-3.1-fast", "seconds": 99},
+                ]
+            )
 
-    def test_estimate_image_wrong_model_type(self):
+    def test_estimate_image_wrong_model_type(self, estimator):
         """Test image estimation with video model."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="does not support image"):
             estimator.estimate_image(model="google/veo-3.1-fast")
-        assert "does not support image" in str(exc.value)
 
-    def test_estimate_free_model(self):
-        """Test estimation for free model."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        estimate = estimator.estimate_image(
-            model="openai/gpt-image-1.5:free",
-            count=10,
-        )
-
-        assert estimate.total_min == 0.0
-        assert estimate.total_max == 0.0
-        assert estimate.total_average == 0.0
-
-    def test_model_not_found(self):
+    def test_model_not_found(self, mock_client):
         """Test estimation with non-existent model."""
-        mock_client = MagicMock()
         mock_client.list_models.return_value = {}
         estimator = CostEstimator(mock_client)
 
-        with pytest.raises(ModelNotFoundError):
+        with pytest.raises(ModelNotFoundError, match="not found"):
             estimator.estimate_video(model="nonexistent/model")
 
-    def test_refresh_models(self):
+    def test_refresh_models(self, mock_client_with_models, cold_estimator):
         """Test refreshing model data."""
-        client = self._create_mock_client()
-        estimator = CostEstimator(client)
-
-        estimator.estimate_video(model="google/veo-3.1-fast", seconds=4)
-        estimator.refresh_models()
-        estimator.estimate_video(model="google/veo-3.1-fast", seconds=4)
+        cold_estimator.estimate_video(model="google/veo-3.1-fast", seconds=4)
+        cold_estimator.refresh_models()
+        cold_estimator.estimate_video(model="google/veo-3.1-fast", seconds=4)
 
-        assert client.list_models.call_count == 2
+        assert mock_client_with_models.list_models.call_count == 2
@@ -41,39 +41,23 @@ class TestImageRouterError:
 class TestSpecificExceptions:
     """Tests for specific exception types."""
 
-    def test_authentication_error(self):
-        """Test AuthenticationError inherits from ImageRouterError."""
-        error = AuthenticationError("Invalid API key", status_code=401)
-        assert isinstance(error, ImageRouterError)
-        assert error.status_code == 401
-
-    def test_rate_limit_error(self):
-        """Test RateLimitError."""
-        error = RateLimitError("Rate limit exceeded", status_code=429)
-        assert isinstance(error, ImageRouterError)
-        assert error.status_code == 429
-
-    def test_insufficient_credits_error(self):
-        """Test InsufficientCreditsError."""
-        error = InsufficientCreditsError("Not enough credits")
-        assert isinstance(error, ImageRouterError)
-
-    def test_model_not_found_error(self):
-        """Test ModelNotFoundError."""
-        error = ModelNotFoundError("Model 'foo/bar' not found", status_code=404)
-        assert isinstance(error, ImageRouterError)
-
-    def test_validation_error(self):
-        """Test ValidationError."""
-        error = ValidationError("Invalid duration")
-        assert isinstance(error, ImageRouterError)
-
-    def test_generation_error(self):
-        """Test GenerationError."""
-        error = GenerationError("Generation failed", status_code=500)
-        assert isinstance(error, ImageRouterError)
+    @pytest.mark.parametrize(
+        "exc_cls,message,status_code",
+        [
+            (AuthenticationError, "Invalid API key", 401),
+            (RateLimitError, "Rate limit exceeded", 429),
+            (InsufficientCreditsError, "Not enough credits", None),
+            (ModelNotFoundError, "Model 'foo/bar' not found", 404),
+            (ValidationError, "Invalid duration", None),
+            (GenerationError, "Generation failed", 500),
+            (NetworkError, "Connection timeout", None),
+        ],
+    )
+    def test_inherits_from_base(self, exc_cls, message, status_code):
+        """Test each specific exception is an ImageRouterError."""
+        kwargs = {} if status_code is None else {"status_code": status_code}
+        error = exc_cls(message, **kwargs)
 
-    def test_network_error(self):
-        """Test NetworkError."""
-        error = NetworkError("Connection timeout")
         assert isinstance(error, ImageRouterError)
+        assert error.message == message
+        assert error.status_code == status_code
@@ -1,52 +1,60 @@
 """Tests for video and image generators."""
 
 import pytest
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import MagicMock, mock_open
 from pathlib import Path
 
 from imagerouter.generators.video import VideoGenerator
 from imagerouter.generators.image import ImageGenerator
 from imagerouter.exceptions import ValidationError
 
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from fixtures.mock_responses import (
-    MOCK_VIDEO_GENERATION_RESPONSE,
-    MOCK_IMAGE_GENERATION_RESPONSE,
-)
+
+class _StubClient:
+    """Stand-in for ImageRouterClient that records requests and returns a canned result."""
+
+    __slots__ = ("_retval", "calls")
+
+    def __init__(self, retval=None):
+        self._retval = retval
+        self.calls = []
+
+    def post_json(self, *args, **kwargs):
+        self.calls.append(("post_json", args, kwargs))
+        return self._retval
+
+    def post_multipart(self, *args, **kwargs):
+        self.calls.append(("post_multipart", args, kwargs))
+        return self._retval
 
 
 class TestVideoGenerator:
     """Tests for VideoGenerator class."""
 
-    def test_text_to_video(self):
+    def test_text_to_video(self, mock_video_generation_response):
         """Test text-to-video generation."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_VIDEO_GENERATION_RESPONSE
+        client = _StubClient(mock_video_generation_response)
 
-        generator = VideoGenerator(mock_client)
+        generator = VideoGenerator(client)
         result = generator.text_to_video(
             prompt="A cat playing piano",
             model="google/veo-3.1-fast",
             seconds=4,
         )
 
-        assert result == MOCK_VIDEO_GENERATION_RESPONSE
-        mock_client.post_json.assert_called_once()
+        assert result == mock_video_generation_response
+        assert len(client.calls) == 1
 
-        call_args = mock_client.post_json.call_args
-        assert call_args[0][0] == "/v1/openai/videos/generations"
-        payload = call_args[0][1]
+        method, (endpoint, payload), _ = client.calls[0]
+        assert (method, endpoint) == ("post_json", "/v1/openai/videos/generations")
         assert payload["prompt"] == "A cat playing piano"
         assert payload["model"] == "google/veo-3.1-fast"
         assert payload["seconds"] == 4
 
-    def test_text_to_video_auto_settings(self):
+    def test_text_to_video_auto_settings(self, mock_video_generation_response):
         """Test text-to-video with auto settings."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_VIDEO_GENERATION_RESPONSE
+        client = _StubClient(mock_video_generation_response)
 
-        generator = VideoGenerator(mock_client)
+        generator = VideoGenerator(client)
         generator.text_to_video(
             prompt="Test",
             model="test/model",
@@ -54,71 +62,47 @@ class TestVideoGenerator:
             size="auto",
         )
 
-        payload = mock_client.post_json.call_args[0][1]
+        _, (_, payload), _ = client.calls[0]
         assert "seconds" not in payload
         assert "size" not in payload
 
     def test_text_to_video_empty_prompt(self):
         """Test text-to-video with empty prompt."""
-        mock_client = MagicMock()
-        generator = VideoGenerator(mock_client)
+        generator = VideoGenerator(_StubClient())
 
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="cannot be empty"):
             generator.text_to_video(
                 prompt="",
                 model="test/model",
             )
-        assert "cannot be empty" in str(exc.value)
-
-    @patch("imagerouter.generators.video.prepare_multiple_images")
-    @patch("imagerouter.generators.video.close_file_handles")
-    def test_image_to_video(self, mock_close, mock_prepare):
-        """Test image-to-video generation."""
-        mock_client = MagicMock()
-        mock_client.post_multipart.return_value = MOCK_VIDEO_GENERATION_RESPONSE
-
-        # Mock file preparation
-        mock_file = MagicMock()
-        mock_prepare.return_value = [("test.jpg", mock_file, "image/jpeg")]
-
-        generator = VideoGenerator(mock_client)
-        result = generator.image_to_video(
-            image_path="test.jpg",
-            prompt="Animate this image",
-            model="kwaivgi/kling-2.1-standard",
-            seconds=5,
-        )
-
-        assert result == MOCK_VIDEO_GENERATION_RESPONSE
-        mock_client.post_multipart.assert_called_once()
-        mock_close.assert_called_once()
 
-    @patch("imagerouter.generators.video.download_file")
-    def test_save_output_url(self, mock_download):
+    def test_save_output_url(self, monkeypatch, mock_video_generation_response):
         """Test saving output from URL response."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_VIDEO_GENERATION_RESPONSE
-        mock_download.return_value = Path("/tmp/output.mp4")
+        client = _StubClient(mock_video_generation_response)
+        mock_download = MagicMock(return_value=Path("/tmp/output.mp4"))
+        monkeypatch.setattr("imagerouter.utils.download_file", mock_download)
 
-        generator = VideoGenerator(mock_client)
+        generator = VideoGenerator(client)
         generator.text_to_video(
             prompt="Test",
             model="test/model",
             output_path="/tmp/output.mp4",
         )
 
-        mock_download.assert_called_once()
+        assert mock_download.call_count == 1
+        args, _ = mock_download.call_args
+        assert args[0] == mock_video_generation_response["data"][0]["url"]
+        assert args[1] == "/tmp/output.mp4"
 
 
 class TestImageGenerator:
     """Tests for ImageGenerator class."""
 
-    def test_text_to_image(self):
+    def test_text_to_image(self, mock_image_generation_response):
         """Test text-to-image generation."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_IMAGE_GENERATION_RESPONSE
+        client = _StubClient(mock_image_generation_response)
 
-        generator = ImageGenerator(mock_client)
+        generator = ImageGenerator(client)
         result = generator.text_to_image(
             prompt="A futuristic city",
             model="openai/gpt-image-1",
@@ -126,23 +110,21 @@ class TestImageGenerator:
             size="1024x1024",
         )
 
-        assert result == MOCK_IMAGE_GENERATION_RESPONSE
-        mock_client.post_json.assert_called_once()
+        assert result == mock_image_generation_response
+        assert len(client.calls) == 1
 
-        call_args = mock_client.post_json.call_args
-        assert call_args[0][0] == "/v1/openai/images/generations"
-        payload = call_args[0][1]
+        method, (endpoint, payload), _ = client.calls[0]
+        assert (method, endpoint) == ("post_json", "/v1/openai/images/generations")
         assert payload["prompt"] == "A futuristic city"
         assert payload["model"] == "openai/gpt-image-1"
         assert payload["quality"] == "high"
         assert payload["size"] == "1024x1024"
 
-    def test_text_to_image_auto_settings(self):
+    def test_text_to_image_auto_settings(self, mock_image_generation_response):
         """Test text-to-image with auto settings."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_IMAGE_GENERATION_RESPONSE
+        client = _StubClient(mock_image_generation_response)
 
-        generator = ImageGenerator(mock_client)
+        generator = ImageGenerator(client)
         generator.text_to_image(
             prompt="Test",
             model="test/model",
@@ -150,80 +132,112 @@ class TestImageGenerator:
             size="auto",
         )
 
-        payload = mock_client.post_json.call_args[0][1]
+        _, (_, payload), _ = client.calls[0]
         assert "quality" not in payload
         assert "size" not in payload
 
-    @patch("imagerouter.generators.image.prepare_multiple_images")
-    @patch("imagerouter.generators.image.close_file_handles")
-    def test_image_to_image(self, mock_close, mock_prepare):
-        """Test image-to-image generation."""
-        mock_client = MagicMock()
-        mock_client.post_multipart.return_value = MOCK_IMAGE_GENERATION_RESPONSE
-
-        mock_file = MagicMock()
-        mock_prepare.return_value = [("test.jpg", mock_file, "image/jpeg")]
-
-        generator = ImageGenerator(mock_client)
-        result = generator.image_to_image(
-            image_path="test.jpg",
-            prompt="Add a sunset",
-            model="openai/gpt-image-1",
-        )
-
-        assert result == MOCK_IMAGE_GENERATION_RESPONSE
-        mock_client.post_multipart.assert_called_once()
-
-        call_args = mock_client.post_multipart.call_args
-        assert call_args[0][0] == "/v1/openai/images/edits"
-
-    @patch("imagerouter.generators.image.prepare_multiple_images")
-    @patch("imagerouter.generators.image.close_file_handles")
-    def test_image_to_image_with_mask(self, mock_close, mock_prepare):
-        """Test image-to-image with mask."""
-        mock_client = MagicMock()
-        mock_client.post_multipart.return_value = MOCK_IMAGE_GENERATION_RESPONSE
-
-        mock_file = MagicMock()
-        mock_prepare.return_value = [("test.jpg", mock_file, "image/jpeg")]
-
-        generator = ImageGenerator(mock_client)
-        generator.image_to_image(
-            image_path="test.jpg",
-            prompt="Edit the sky",
-            model="openai/gpt-image-1",
-            mask_path="mask.png",
-        )
-
-        # Should prepare both image and mask
-        assert mock_prepare.call_count == 2
-
     def test_empty_prompt(self):
         """Test generation with empty prompt."""
-        mock_client = MagicMock()
-        generator = ImageGenerator(mock_client)
+        generator = ImageGenerator(_StubClient())
 
-        with pytest.raises(ValidationError):
+        with pytest.raises(ValidationError, match="cannot be empty"):
             generator.text_to_image(
                 prompt="   ",
                 model="test/model",
             )
 
-    @patch("imagerouter.generators.image.download_file")
-    def test_save_output(self, mock_download):
+    def test_save_output(self, monkeypatch, mock_image_generation_response):
         """Test saving output to file."""
-        mock_client = MagicMock()
-        mock_client.post_json.return_value = MOCK_IMAGE_GENERATION_RESPONSE
-        mock_download.return_value = Path("/tmp/output.png")
+        client = _StubClient(mock_image_generation_response)
+        mock_download = MagicMock(return_value=Path("/tmp/output.png"))
+        monkeypatch.setattr("imagerouter.utils.download_file", mock_download)
 
-        generator = ImageGenerator(mock_client)
+        generator = ImageGenerator(client)
         generator.text_to_image(
             prompt="Test",
             model="test/model",
             output_path="/tmp/output.png",
         )
 
-        mock_download.assert_called_once_with(
-            MOCK_IMAGE_GENERATION_RESPONSE["data"][0]["url"],
-            "/tmp/output.png",
+        assert mock_download.call_count == 1
+        args, _ = mock_download.call_args
+        assert args[0] == mock_image_generation_response["data"][0]["url"]
+        assert args[1] == "/tmp/output.png"
+
+    def test_get_bytes(self):
+        """Test decoding a base64 result in memory."""
+        generator = ImageGenerator(_StubClient())
+        result = {"data": [{"b64_json": "aW1hZ2UgYnl0ZXM="}]}
+
+        assert generator.get_bytes(result).read() == b"image bytes"
+
+    def test_get_bytes_url_response(self, mock_image_generation_response):
+        """Test URL responses are rejected."""
+        generator = ImageGenerator(_StubClient())
+
+        with pytest.raises(ValidationError, match="no base64 data"):
+            generator.get_bytes(mock_image_generation_response)
+
+
+class TestMultipartGeneration:
+    """Tests for the multipart image-to-video and image-to-image requests."""
+
+    @pytest.mark.parametrize(
+        "gen_cls,endpoint,extra_kwargs",
+        [
+            (VideoGenerator, "/v1/openai/videos/generations", {"seconds": 5}),
+            (ImageGenerator, "/v1/openai/images/edits", {}),
+            (ImageGenerator, "/v1/openai/images/edits", {"mask_path": "mask.png"}),
+        ],
+        ids=["image-to-video", "image-to-image", "image-to-image-with-mask"],
+    )
+    def test_multipart_request(self, gen_cls, endpoint, extra_kwargs, monkeypatch):
+        """Test uploads are posted to the right endpoint and file handles closed."""
+        mock_prepare = MagicMock(return_value=[("test.jpg", MagicMock(), "image/jpeg")])
+        mock_close = MagicMock()
+        monkeypatch.setattr(f"{gen_cls.__module__}.prepare_multiple_images", mock_prepare)
+        monkeypatch.setattr(f"{gen_cls.__module__}.close_file_handles", mock_close)
+
+        canned = {"data": []}
+        client = _StubClient(canned)
+        generator = gen_cls(client)
+        if gen_cls is VideoGenerator:
+            method = generator.image_to_video
+        else:
+            method = generator.image_to_image
+        result = method(
+            image_path="test.jpg",
+            prompt="Edit this image",
+            model="test/model",
+            **extra_kwargs,
+        )
+
+        assert result is canned
+        assert [(call[0], call[1][0]) for call in client.calls] == [("post_multipart", endpoint)]
+        mock_close.assert_called()
+        # The mask is prepared separately from the input images
+        assert mock_prepare.call_count == (2 if "mask_path" in extra_kwargs else 1)
+
+    def test_invalid_mask_closes_image_handles(self, monkeypatch):
+        """Test the opened images are closed when preparing the mask fails."""
+        image_tuples = [("test.jpg", MagicMock(), "image/jpeg")]
+        mock_prepare = MagicMock(
+            side_effect=[image_tuples, ValidationError("Image file not found: mask.png")]
         )
+        mock_close = MagicMock()
+        monkeypatch.setattr("imagerouter.generators.image.prepare_multiple_images", mock_prepare)
+        monkeypatch.setattr("imagerouter.generators.image.close_file_handles", mock_close)
+
+        client = _StubClient()
+        generator = ImageGenerator(client)
+        with pytest.raises(ValidationError, match="mask.png"):
+            generator.image_to_image(
+                image_path="test.jpg",
+                prompt="Edit this image",
+                model="test/model",
+                mask_path="mask.png",
+            )
+
+        assert mock_prepare.call_count == 2
+        assert image_tuples in [call.args[0] for call in mock_close.call_args_list]
+        assert client.calls == []
@@ -1,76 +1,87 @@
 """Tests for models module."""
 
+import sys
+
 import pytest
-from unittest.mock import MagicMock
 
 from imagerouter.models import ModelInfo, ModelRegistry, PricingInfo
 from imagerouter.exceptions import ModelNotFoundError
 
-# Import mock data
-import sys
-sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
-from fixtures.mock_responses import MOCK_MODELS_RESPONSE
+
+@pytest.fixture(scope="session")
+def zero_price():
+    """Free fixed pricing, shared by models whose price is irrelevant to the test."""
+    return PricingInfo(pricing_type="fixed", value=0)
+
+
+@pytest.fixture(scope="session")
+def make_model(zero_price):
+    """Build a minimal ModelInfo; video if durations are given, image otherwise."""
+
+    def _make(durations=None):
+        return ModelInfo(
+            id="test",
+            name="Test",
+            provider="Test",
+            output_types=["video" if durations else "image"],
+            pricing=zero_price,
+            supported_durations=durations,
+        )
+
+    return _make
 
 
 class TestPricingInfo:
     """Tests for PricingInfo dataclass."""
 
-    def test_from_fixed_pricing(self):
-        """Test parsing fixed pricing data."""
-        data = {"type": "fixed", "value": 0.23}
-        pricing = PricingInfo.from_api_data(data)
-
-        assert pricing.pricing_type == "fixed"
-        assert pricing.value == 0.23
-        assert pricing.min_price == 0.23
-        assert pricing.max_price == 0.23
-        assert pricing.average_price == 0.23
-
-    def test_from_range_pricing(self):
-        """Test parsing range-based pricing data."""
-        data = {
-            "type": "calculated",
-            "range": {"min": 0.60, "average": 0.90, "max": 1.20},
-        }
+    @pytest.mark.parametrize(
+        "data,expected",
+        [
+            ({"type": "fixed", "value": 0.23}, ("fixed", 0.23, 0.23, 0.23, 0.23)),
+            (
+                {"type": "calculated", "range": {"min": 0.60, "average": 0.90, "max": 1.20}},
+                ("calculated", None, 0.60, 0.90, 1.20),
+            ),
+        ],
+    )
+    def test_from_api_data(self, data, expected):
+        """Test parsing fixed and range-based pricing data."""
         pricing = PricingInfo.from_api_data(data)
 
-        assert pricing.pricing_type == "calculated"
-        assert pricing.value is None
-        assert pricing.min_price == 0.60
-        assert pricing.max_price == 1.20
-        assert pricing.average_price == 0.90
-
-    def test_get_estimate_fixed(self):
-        """Test get_estimate for fixed pricing."""
-        pricing = PricingInfo(pricing_type="fixed", value=0.50)
-        min_p, avg_p, max_p = pricing.get_estimate()
-
-        assert min_p == 0.50
-        assert avg_p == 0.50
-        assert max_p == 0.50
-
-    def test_get_estimate_range(self):
-        """Test get_estimate for range pricing."""
-        pricing = PricingInfo(
-            pricing_type="calculated",
-            min_price=0.10,
-            average_price=0.20,
-            max_price=0.30,
-        )
-        min_p, avg_p, max_p = pricing.get_estimate()
-
-        assert min_p == 0.10
-        assert avg_p == 0.20
-        assert max_p == 0.30
+        assert (
+            pricing.pricing_type,
+            pricing.value,
+            pricing.min_price,
+            pricing.average_price,
+            pricing.max_price,
+        ) == expected
+
+    @pytest.mark.parametrize(
+        "pricing,expected",
+        [
+            (PricingInfo(pricing_type="fixed", value=0.50), (0.50, 0.50, 0.50)),
+            (
+                PricingInfo(
+                    pricing_type="calculated",
+                    min_price=0.10,
+                    average_price=0.20,
+                    max_price=0.30,
+                ),
+                (0.10, 0.20, 0.30),
+            ),
+        ],
+    )
+    def test_get_estimate(self, pricing, expected):
+        """Test get_estimate returns (min, average, max)."""
+        assert pricing.get_estimate() == expected
 
 
 class TestModelInfo:
     """Tests for ModelInfo dataclass."""
 
-    def test_from_api_data_video_model(self):
+    def test_from_api_data_video_model(self, parsed_models):
         """Test parsing video model data."""
-        data = MOCK_MODELS_RESPONSE["data"][0]  # google/veo-3.1-fast
-        model = ModelInfo.from_api_data(data)
+        model = parsed_models["google/veo-3.1-fast"]
 
         assert model.id == "google/veo-3.1-fast"
         assert model.name == "Veo 3.1 Fast"
@@ -79,103 +90,84 @@ class TestModelInfo:
         assert model.supported_durations == [4, 6, 8]
         assert model.is_video_model()
         assert not model.is_image_model()
+        assert not hasattr(model, "__dict__")
+        assert not hasattr(model.pricing, "__dict__")
 
-    def test_from_api_data_image_model(self):
+    def test_from_api_data_image_model(self, parsed_models):
         """Test parsing image model data."""
-        data = MOCK_MODELS_RESPONSE["data"][2]  # openai/gpt-image-1
-        model = ModelInfo.from_api_data(data)
+        model = parsed_models["openai/gpt-image-1"]
 
         assert model.id == "openai/gpt-image-1"
         assert model.is_image_model()
         assert not model.is_video_model()
         assert model.supports_edit
 
-    def test_get_default_duration(self):
+    def test_get_default_duration(self, make_model):
         """Test getting default duration."""
-        model = ModelInfo(
-            id="test",
-            name="Test",
-            provider="Test",
-            output_types=["video"],
-            pricing=PricingInfo(pricing_type="fixed", value=0),
-            supported_durations=[5, 10],
-        )
-        assert model.get_default_duration() == 5
+        assert make_model([5, 10]).get_default_duration() == 5
 
-    def test_get_default_duration_none(self):
+    def test_get_default_duration_none(self, make_model):
         """Test getting default duration when not available."""
-        model = ModelInfo(
-            id="test",
-            name="Test",
-            provider="Test",
-            output_types=["image"],
-            pricing=PricingInfo(pricing_type="fixed", value=0),
-        )
-        assert model.get_default_duration() is None
+        assert make_model().get_default_duration() is None
 
 
 class TestModelRegistry:
     """Tests for ModelRegistry class."""
 
-    def test_get_model(self):
+    def test_get_model(self, mock_client_with_models):
         """Test getting a model by ID."""
-        mock_client = MagicMock()
+        registry = ModelRegistry(mock_client_with_models)
+        model = registry.get_model("google/veo-3.1-fast")
+
+        assert model.id == "google/veo-3.1-fast"
+        mock_client_with_models.list_models.assert_called_once()
+
+    def test_get_model_parses_only_requested(self, mock_client_with_models):
+        """Test that a single lookup does not parse every model."""
+        registry = ModelRegistry(mock_client_with_models)
+        model = registry.get_model("google/veo-3.1-fast")
+
+        assert list(registry._models) == ["google/veo-3.1-fast"]
+        assert registry.get_all_models()["google/veo-3.1-fast"] is model
+
+    def test_model_ids_are_interned(self, mock_client, mock_models_response):
+        """Test registry keys are interned at load."""
+        model_id = "".join(["google/", "veo-3.1-fast"])
         mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
+            model_id: mock_models_response["data"][0],
         }
 
         registry = ModelRegistry(mock_client)
-        model = registry.get_model("google/veo-3.1-fast")
+        key = next(iter(registry.get_all_models()))
 
-        assert model.id == "google/veo-3.1-fast"
-        mock_client.list_models.assert_called_once()
+        assert key is sys.intern("google/veo-3.1-fast")
 
-    def test_get_model_not_found(self):
+    def test_get_model_not_found(self, mock_client):
         """Test getting a non-existent model."""
-        mock_client = MagicMock()
         mock_client.list_models.return_value = {}
 
         registry = ModelRegistry(mock_client)
 
-        with pytest.raises(ModelNotFoundError):
+        with pytest.raises(ModelNotFoundError, match="not found"):
             registry.get_model("nonexistent/model")
 
-    def test_get_video_models(self):
+    def test_get_video_models(self, mock_client_with_models, expected_video_ids):
         """Test filtering video models."""
-        mock_client = MagicMock()
-        mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
-        }
-
-        registry = ModelRegistry(mock_client)
+        registry = ModelRegistry(mock_client_with_models)
         video_models = registry.get_video_models()
 
-        assert "google/veo-3.1-fast" in video_models
-        assert "ir/test-video" in video_models
-        assert "openai/gpt-image-1" not in video_models
+        assert video_models.keys() == expected_video_ids
 
-    def test_get_image_models(self):
+    def test_get_image_models(self, mock_client_with_models, expected_image_ids):
         """Test filtering image models."""
-        mock_client = MagicMock()
-        mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
-        }
-
-        registry = ModelRegistry(mock_client)
+        registry = ModelRegistry(mock_client_with_models)
         image_models = registry.get_image_models()
 
-        assert "openai/gpt-image-1" in image_models
-        assert "openai/gpt-image-1.5:free" in image_models
-        assert "google/veo-3.1-fast" not in image_models
+        assert image_models.keys() == expected_image_ids
 
-    def test_caching(self):
+    def test_caching(self, mock_client_with_models):
         """Test that models are cached."""
-        mock_client = MagicMock()
-        mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
-        }
-
-        registry = ModelRegistry(mock_client)
+        registry = ModelRegistry(mock_client_with_models)
 
         # First call
         registry.get_all_models()
@@ -183,19 +175,27 @@ class TestModelRegistry:
         registry.get_all_models()
 
         # Should only call API once
-        mock_client.list_models.assert_called_once()
+        mock_client_with_models.list_models.assert_called_once()
 
-    def test_refresh(self):
-        """Test refreshing model data."""
-        mock_client = MagicMock()
-        mock_client.list_models.return_value = {
-            model["id"]: model for model in MOCK_MODELS_RESPONSE["data"]
-        }
+    def test_type_views_are_cached_and_read_only(self, mock_client_with_models):
+        """Test filtered views are built once and cannot be mutated."""
+        registry = ModelRegistry(mock_client_with_models)
+        video_models = registry.get_video_models()
 
-        registry = ModelRegistry(mock_client)
+        assert registry.get_models_by_type("video") is video_models
+        with pytest.raises(TypeError):
+            video_models["new/model"] = video_models["ir/test-video"]
+
+        registry.refresh()
+        assert registry.get_video_models() is not video_models
+
+    def test_refresh(self, mock_client_with_models):
+        """Test refreshing model data."""
+        registry = ModelRegistry(mock_client_with_models)
         registry.get_all_models()
         registry.refresh()
         registry.get_all_models()
 
         # Should call API twice (initial + refresh)
-        assert mock_client.list_models.call_count == 2
+        assert mock_client_with_models.list_models.call_count == 2
+        mock_client_with_models.list_models.assert_called_with(revalidate=True)
@@ -1,135 +1,219 @@
 """Tests for utility functions."""
 
+import base64
+import io
 import pytest
 import tempfile
 import os
+import stat
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import requests
+
+from imagerouter import utils
 from imagerouter.utils import (
     validate_image_path,
+    prepare_multiple_images,
+    close_file_handles,
     get_mime_type,
     validate_prompt,
     infer_output_extension,
     ensure_output_path,
+    save_base64_content,
+    decode_base64_content,
+    save_generation_output,
+    download_file,
+    close_download_session,
     SUPPORTED_IMAGE_FORMATS,
 )
-from imagerouter.exceptions import ValidationError
+from imagerouter.exceptions import NetworkError, ValidationError
+from urllib3.exceptions import ProtocolError
+
+
+def _response_spec():
+    """Build a populated Response whose attribute set bounds mock responses."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b""
+    return response
+
+
+_RESPONSE_SPEC = _response_spec()
+
+# Overlong prompts, built once at import and shared by the parametrized cases
+_LONG_PROMPT = "a" * 10001
+_MEDIUM_PROMPT = "a" * 100
+
+
+@pytest.fixture
+def fake_files(monkeypatch):
+    """Answer utils._stat from a path -> st_mode table instead of the disk."""
+    modes = {}
+
+    def fake_stat(path, *args, **kwargs):
+        try:
+            mode = modes[os.fspath(path)]
+        except KeyError:
+            raise FileNotFoundError(2, "No such file or directory", os.fspath(path)) from None
+        return os.stat_result((mode,) + (0,) * 9)
+
+    monkeypatch.setattr(utils, "_stat", fake_stat)
+    return modes
 
 
 class TestValidateImagePath:
     """Tests for image path validation."""
 
-    def test_valid_image(self, tmp_path):
+    def test_valid_image(self, fake_files):
         """Test validation of valid image file."""
-        img_file = tmp_path / "test.jpg"
-        img_file.write_bytes(b"fake image data")
+        fake_files["/img/test.jpg"] = stat.S_IFREG
 
-        result = validate_image_path(str(img_file))
-        assert result == img_file.resolve()
+        result = validate_image_path("/img/test.jpg")
+        assert result == Path("/img/test.jpg").resolve()
 
-    def test_file_not_found(self):
+    def test_file_not_found(self, fake_files):
         """Test validation of non-existent file."""
-        with pytest.raises(ValidationError) as exc:
+        with pytest.raises(ValidationError, match="not found"):
             validate_image_path("/nonexistent/image.jpg")
-        assert "not found" in str(exc.value)
 
-    def test_unsupported_format(self, tmp_path):
+    def test_unsupported_format(self, fake_files):
         """Test validation of unsupported format."""
-        bad_file = tmp_path / "test.bmp"
-        bad_file.write_bytes(b"fake data")
+        fake_files["/img/test.bmp"] = stat.S_IFREG
 
-        with pytest.raises(ValidationError) as exc:
-            validate_image_path(str(bad_file))
-        assert "Unsupported image format" in str(exc.value)
+        with pytest.raises(ValidationError, match="Unsupported image format"):
+            validate_image_path("/img/test.bmp")
 
-    def test_directory_not_file(self, tmp_path):
+    def test_directory_not_file(self, fake_files):
         """Test validation rejects directories."""
-        with pytest.raises(ValidationError) as exc:
-            validate_image_path(str(tmp_path))
-        assert "not a file" in str(exc.value)
+        fake_files["/img"] = stat.S_IFDIR
+
+        with pytest.raises(ValidationError, match="not a file"):
+            validate_image_path("/img")
+
+
+class TestPrepareMultipleImages:
+    """Tests for preparing several images for upload."""
+
+    def test_opens_all_files(self, tmp_path):
+        """Test each valid path yields an open handle."""
+        paths = []
+        for name in ("a.png", "b.jpg"):
+            (tmp_path / name).write_bytes(b"data")
+            paths.append(str(tmp_path / name))
+
+        files = prepare_multiple_images(paths)
+        try:
+            assert [(name, mime) for name, _, mime in files] == [
+                ("a.png", "image/png"),
+                ("b.jpg", "image/jpeg"),
+            ]
+            assert all(not f.closed for _, f, _ in files)
+        finally:
+            close_file_handles(files)
+
+    def test_invalid_path_opens_nothing(self, tmp_path):
+        """Test a bad path is rejected before any file is opened."""
+        good = tmp_path / "good.png"
+        good.write_bytes(b"data")
+
+        with patch("builtins.open") as mock_open:
+            with pytest.raises(ValidationError, match="not found"):
+                prepare_multiple_images([str(good), str(tmp_path / "missing.png")])
+        mock_open.assert_not_called()
+
+    def test_open_failure_closes_opened(self, tmp_path):
+        """Test handles opened before a failure are closed."""
+        paths = []
+        for name in ("a.png", "b.png"):
+            (tmp_path / name).write_bytes(b"data")
+            paths.append(str(tmp_path / name))
+        first = io.BytesIO(b"data")
+
+        with patch("builtins.open", side_effect=[first, PermissionError("denied")]):
+            with pytest.raises(PermissionError):
+                prepare_multiple_images(paths)
+        assert first.closed
+
+    def test_too_many_images(self):
+        """Test the per-request image limit."""
+        with pytest.raises(ValidationError, match="Maximum 16 images"):
+            prepare_multiple_images(["missing.png"] * 17)
 
 
 class TestGetMimeType:
     """Tests for MIME type detection."""
 
-    def test_jpeg(self):
-        """Test JPEG MIME type."""
-        assert get_mime_type("test.jpg") == "image/jpeg"
-        assert get_mime_type("test.jpeg") == "image/jpeg"
-
-    def test_png(self):
-        """Test PNG MIME type."""
-        assert get_mime_type("test.png") == "image/png"
-
-    def test_webp(self):
-        """Test WebP MIME type."""
-        assert get_mime_type("test.webp") == "image/webp"
-
-    def test_mp4(self):
-        """Test MP4 MIME type."""
-        assert get_mime_type("video.mp4") == "video/mp4"
-
-    def test_unknown(self):
-        """Test unknown format fallback."""
-        result = get_mime_type("file.unknownext123")
-        assert result == "application/octet-stream"
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("test.jpg", "image/jpeg"),
+            ("test.jpeg", "image/jpeg"),
+            ("test.png", "image/png"),
+            ("test.webp", "image/webp"),
+            ("video.mp4", "video/mp4"),
+            ("PHOTO.PNG", "image/png"),
+            ("notes.txt", "text/plain"),
+            ("file.unknownext123", "application/octet-stream"),
+        ],
+    )
+    def test_mime_type(self, path, expected):
+        """Test MIME types for supported, system-known and unknown suffixes."""
+        assert get_mime_type(path) == expected
+
+    def test_known_types_skip_mimetypes(self):
+        """Test supported formats don't consult the system database."""
+        with patch("imagerouter.utils.mimetypes.guess_type") as mock_guess:
+            assert get_mime_type("clip.webm") == "video/webm"
+        mock_guess.assert_not_called()
 
 
 class TestValidatePrompt:
     """Tests for prompt validation."""
 
-    def test_valid_prompt(self):
-        """Test valid prompt."""
-        result = validate_prompt("A beautiful sunset")
-        assert result == "A beautiful sunset"
-
-    def test_prompt_with_whitespace(self):
-        """Test prompt with leading/trailing whitespace."""
-        result = validate_prompt("  A sunset  ")
-        assert result == "A sunset"
-
-    def test_empty_prompt(self):
-        """Test empty prompt."""
-        with pytest.raises(ValidationError) as exc:
-            validate_prompt("")
-        assert "cannot be empty" in str(exc.value)
-
-    def test_whitespace_only_prompt(self):
-        """Test whitespace-only prompt."""
-        with pytest.raises(ValidationError) as exc:
-            validate_prompt("   ")
-        assert "cannot be empty" in str(exc.value)
-
-    def test_prompt_too_long(self):
-        """Test prompt exceeding max length."""
-        long_prompt = "a" * 10001
-        with pytest.raises(ValidationError) as exc:
-            validate_prompt(long_prompt)
-        assert "too long" in str(exc.value)
-
-    def test_prompt_custom_max_length(self):
-        """Test prompt with custom max length."""
-        prompt = "a" * 100
-        with pytest.raises(ValidationError):
-            validate_prompt(prompt, max_length=50)
+    @pytest.mark.parametrize(
+        "prompt,max_length,expected",
+        [
+            ("A beautiful sunset", 10000, "A beautiful sunset"),
+            ("  A sunset  ", 10000, "A sunset"),
+            ("   " + "a" * 10 + "   ", 10, "a" * 10),
+        ],
+    )
+    def test_valid_prompt(self, prompt, max_length, expected):
+        """Test valid prompts are stripped before the length check."""
+        assert validate_prompt(prompt, max_length=max_length) == expected
+
+    @pytest.mark.parametrize(
+        "prompt,max_length,message",
+        [
+            ("", 10000, "cannot be empty"),
+            ("   ", 10000, "cannot be empty"),
+            (_LONG_PROMPT, 10000, "too long"),
+            (_MEDIUM_PROMPT, 50, "too long"),
+        ],
+        ids=["empty", "whitespace", "over-default-limit", "over-custom-limit"],
+    )
+    def test_invalid_prompt(self, prompt, max_length, message):
+        """Test empty, whitespace-only and overlong prompts."""
+        with pytest.raises(ValidationError, match=message):
+            validate_prompt(prompt, max_length=max_length)
 
 
 class TestInferOutputExtension:
     """Tests for output extension inference."""
 
-    def test_video_default(self):
-        """Test default video extension."""
-        assert infer_output_extension("video") == ".mp4"
-
-    def test_image_default(self):
-        """Test default image extension."""
-        assert infer_output_extension("image") == ".png"
-
-    def test_preserve_existing_extension(self):
-        """Test preserving existing extension."""
-        assert infer_output_extension("video", "output.webm") == ".webm"
-        assert infer_output_extension("image", "output.jpg") == ".jpg"
+    @pytest.mark.parametrize(
+        "generation_type,output_path,expected",
+        [
+            ("video", None, ".mp4"),
+            ("image", None, ".png"),
+            ("video", "output.webm", ".webm"),
+            ("image", "output.jpg", ".jpg"),
+        ],
+    )
+    def test_extension(self, generation_type, output_path, expected):
+        """Test defaults per type and preservation of an existing extension."""
+        assert infer_output_extension(generation_type, output_path) == expected
 
 
 class TestEnsureOutputPath:
@@ -150,3 +234,191 @@ class TestEnsureOutputPath:
         result = ensure_output_path(None, "video", "google/veo-3.1-fast")
         assert result.suffix == ".mp4"
         assert "google_veo-3.1-fast" in result.stem
+
+
+@pytest.fixture(params=["stdlib", "pybase64"])
+def b64_backend(request, monkeypatch):
+    """Run the chunked base64 decoder with each available backend."""
+    if request.param == "pybase64":
+        decode = pytest.importorskip("pybase64").b64decode
+    else:
+        decode = base64.b64decode
+    monkeypatch.setattr(utils, "_b64decode_canonical", decode)
+
+
+class TestSaveBase64Content:
+    """Tests for saving base64 content."""
+
+    def test_decodes_across_chunks(self, tmp_path, monkeypatch):
+        """Test payloads larger than one decode chunk."""
+        monkeypatch.setattr("imagerouter.utils.BASE64_CHUNK_SIZE", 8)
+        payload = bytes(range(256)) * 3 + b"x"
+        out_file = tmp_path / "out.bin"
+
+        result = save_base64_content(base64.b64encode(payload).decode(), str(out_file))
+
+        assert result == out_file.resolve()
+        assert out_file.read_bytes() == payload
+
+    def test_ignores_line_breaks(self, tmp_path, monkeypatch):
+        """Test base64 wrapped over several lines."""
+        monkeypatch.setattr("imagerouter.utils.BASE64_CHUNK_SIZE", 8)
+        encoded = base64.encodebytes(b"some image bytes" * 10).decode()
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content(encoded, str(out_file))
+
+        assert out_file.read_bytes() == b"some image bytes" * 10
+
+    @pytest.mark.parametrize("payload", [b"abc", b"abcd", b"abcde", b""])
+    def test_exact_size_with_padding(self, tmp_path, payload):
+        """Test preallocation matches the decoded size for each padding."""
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content(base64.b64encode(payload).decode(), str(out_file))
+
+        assert out_file.read_bytes() == payload
+
+    def test_skipped_characters_trimmed(self, tmp_path):
+        """Test stray characters do not leave zero bytes at the end."""
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content("YWJj!!!!", str(out_file))
+
+        assert out_file.read_bytes() == b"abc"
+
+    def test_stray_character_across_chunks(self, tmp_path, monkeypatch):
+        """Test a single non-alphabet character does not shift later chunks."""
+        monkeypatch.setattr("imagerouter.utils.BASE64_CHUNK_SIZE", 8)
+        payload = b"some image bytes" * 4
+        encoded = base64.b64encode(payload).decode()
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content(encoded[:6] + "!" + encoded[6:], str(out_file))
+
+        assert out_file.read_bytes() == payload
+
+    def test_truncated_data_fails_before_open(self, tmp_path):
+        """Test a truncated payload is rejected without creating a file."""
+        out_file = tmp_path / "out.bin"
+
+        with patch("builtins.open") as mock_open:
+            with pytest.raises(ValidationError, match="incorrect padding"):
+                save_base64_content("YWJjZA=", str(out_file))
+        mock_open.assert_not_called()
+
+    @pytest.mark.parametrize("data", ["YWJj!", "YW\nJj", "!YWJj", "YWJj=", "YW=Jj"])
+    def test_length_checked_after_filtering(self, tmp_path, data):
+        """Test stray characters do not count towards the length check."""
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content(data, str(out_file))
+
+        assert out_file.read_bytes() == decode_base64_content(data) == b"abc"
+
+    @pytest.mark.parametrize(
+        "data",
+        ["YWJjYQ==", "YWJjYQ===", "YWJjYWI=", "YWJj====", "YWJjYQ", "YWJjYQ=", "YWJjY==="],
+    )
+    def test_padding_matches_b64decode(self, tmp_path, monkeypatch, data):
+        """Test trailing padding is accepted or rejected exactly as b64decode does."""
+        monkeypatch.setattr("imagerouter.utils.BASE64_CHUNK_SIZE", 4)
+        out_file = tmp_path / "out.bin"
+        try:
+            expected = base64.b64decode(data)
+        except ValueError:
+            with pytest.raises(ValidationError, match="Failed to decode"):
+                save_base64_content(data, str(out_file))
+            assert not out_file.exists()
+        else:
+            save_base64_content(data, str(out_file))
+            assert out_file.read_bytes() == expected
+
+    @pytest.mark.parametrize("data", ["YWJjYQ==", "YWJj\nYWI=", "YQ==YWJj", "YW=Jj"])
+    def test_same_result_with_either_backend(self, tmp_path, monkeypatch, b64_backend, data):
+        """Test the save path matches the stdlib decoder whichever backend is installed."""
+        monkeypatch.setattr("imagerouter.utils.BASE64_CHUNK_SIZE", 4)
+        out_file = tmp_path / "out.bin"
+
+        save_base64_content(data, str(out_file))
+
+        assert out_file.read_bytes() == decode_base64_content(data) == base64.b64decode(data)
+
+    def test_invalid_data(self, tmp_path):
+        """Test invalid base64 leaves no partial file."""
+        out_file = tmp_path / "out.bin"
+
+        with pytest.raises(ValidationError, match="Failed to decode"):
+            save_base64_content("abcde", str(out_file))
+        assert not out_file.exists()
+
+
+class TestSaveGenerationOutput:
+    """Tests for saving generation responses."""
+
+    def test_base64_output(self, tmp_path):
+        """Test a base64 response is decoded to the output path."""
+        out_file = tmp_path / "out.png"
+        result = {"data": [{"b64_json": base64.b64encode(b"png bytes").decode()}]}
+
+        assert save_generation_output(result, str(out_file)) == out_file.resolve()
+        assert out_file.read_bytes() == b"png bytes"
+
+    def test_empty_response(self, tmp_path):
+        """Test a response without outputs."""
+        with pytest.raises(ValidationError, match="No output data"):
+            save_generation_output({"data": []}, str(tmp_path / "out.png"))
+
+
+class TestDownloadFile:
+    """Tests for downloading outputs."""
+
+    @patch("imagerouter.utils.requests.Session.get")
+    def test_download_reuses_session(self, mock_get, tmp_path):
+        """Test downloads share one pooled session."""
+
+        def respond(url, **kwargs):
+            mock_response = MagicMock(spec_set=_RESPONSE_SPEC)
+            mock_response.__enter__.return_value = mock_response
+            mock_response.raw = io.BytesIO(b"video-bytes")
+            return mock_response
+
+        mock_get.side_effect = respond
+
+        close_download_session()
+        first = download_file("https://storage/a.mp4", str(tmp_path / "a.mp4"))
+        session = utils._download_session
+        download_file("https://storage/b.mp4", str(tmp_path / "b.mp4"))
+
+        assert first.read_bytes() == b"video-bytes"
+        assert mock_get.call_count == 2
+        assert session is not None and utils._download_session is session
+
+        close_download_session()
+        assert utils._download_session is None
+
+    @patch("imagerouter.utils.requests.Session.get")
+    def test_download_interrupted(self, mock_get, tmp_path):
+        """Test a dropped connection mid-download raises NetworkError."""
+        mock_response = MagicMock(spec_set=_RESPONSE_SPEC)
+        mock_response.__enter__.return_value = mock_response
+        mock_response.raw.read.side_effect = ProtocolError("Connection broken")
+        mock_get.return_value = mock_response
+
+        with pytest.raises(NetworkError):
+            download_file("https://storage/a.mp4", str(tmp_path / "a.mp4"))
+
+    def test_download_retry_configuration(self):
+        """Test downloads retry rate limits and server errors."""
+        close_download_session()
+        retry = utils._get_download_session().get_adapter("https://storage").max_retries
+        close_download_session()
+
+        assert retry.total == 5
+        assert retry.is_retry("GET", 429)
+        assert retry.is_retry("GET", 503)
+
+    def test_missing_output_directory(self, tmp_path):
+        """Test download into a directory that doesn't exist."""
+        with pytest.raises(ValidationError, match="does not exist"):
+            download_file("https://storage/a.mp4", str(tmp_path / "missing" / "a.mp4"))